@@ -24,7 +24,7 @@ from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic
 revision = 'migrate_fks_to_devices_u1'
-down_revision = 'add_maintenance_fields_u1'  # Depends on maintenance fields migration
+down_revision = 'add_booking_window_index_u2'  # After the standalone U2 index revisions
 branch_labels = None
 depends_on = None
 
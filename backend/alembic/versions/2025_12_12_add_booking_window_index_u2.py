@@ -0,0 +1,46 @@
+"""Index booking_table on the booking time window
+
+Revision ID: add_booking_window_index_u2
+Revises: add_devices_device_type_index_u2
+Create Date: 2025-12-12 10:30:00
+
+Week/overlap queries filter on start_time < :end AND end_time > :start.
+ix_booking_window lets them range-scan instead of reading the whole table,
+and carries device_id/user_id for the joins. The upgrade is a no-op when
+the index exists.
+
+Like add_devices_device_type_index_u2, this sits before the held-back
+migrate_fks_to_devices_u1 and can be applied on its own.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_booking_window_index_u2'
+down_revision = 'add_devices_device_type_index_u2'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_booking_window'
+
+
+def _has_index():
+    inspector = sa.inspect(op.get_bind())
+    return any(ix['name'] == INDEX_NAME for ix in inspector.get_indexes('booking_table'))
+
+
+def upgrade():
+    """Create ix_booking_window unless it already exists."""
+    if not _has_index():
+        op.create_index(
+            INDEX_NAME,
+            'booking_table',
+            ['start_time', 'end_time', 'device_id', 'user_id'],
+        )
+
+
+def downgrade():
+    """Drop ix_booking_window."""
+    if _has_index():
+        op.drop_index(INDEX_NAME, table_name='booking_table')
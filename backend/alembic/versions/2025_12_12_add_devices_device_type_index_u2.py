@@ -0,0 +1,41 @@
+"""Index devices.device_type_id for the devices/device_types join
+
+Revision ID: add_devices_device_type_index_u2
+Revises: add_maintenance_fields_u1
+Create Date: 2025-12-12 10:00:00
+
+The model declares index=True on device_type_id, but databases that were not
+created from the models can be missing it. Without it, joining devices to
+device_types full-scans devices. The upgrade is a no-op when the index exists.
+
+Chained before migrate_fks_to_devices_u1, which must not run yet, so the
+index can be applied on its own (see add_booking_window_index_u2).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_devices_device_type_index_u2'
+down_revision = 'add_maintenance_fields_u1'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_devices_device_type_id'
+
+
+def _has_index():
+    inspector = sa.inspect(op.get_bind())
+    return any(ix['name'] == INDEX_NAME for ix in inspector.get_indexes('devices'))
+
+
+def upgrade():
+    """Create ix_devices_device_type_id unless it already exists."""
+    if not _has_index():
+        op.create_index(INDEX_NAME, 'devices', ['device_type_id'])
+
+
+def downgrade():
+    """Drop ix_devices_device_type_id."""
+    if _has_index():
+        op.drop_index(INDEX_NAME, table_name='devices')
@@ -1,7 +1,13 @@
 # hashing.py
+import os
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Work factor for new hashes (passlib's default is 12). The test suite lowers
+# it; existing hashes keep the rounds they were created with
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 def hash_password(plain_password: str) -> str:
     # Given a plaintext password, return the bcrypt hash.
@@ -23,6 +23,23 @@ import re
 
 User = SchedulerUser
 
+# Scheduler maintenance format: "<segment>/<YYYY-MM-DD>", e.g. "All Day/2023-10-01"
+_MAINT_RE = re.compile(r"^(?P<segment>[^/]*)/(?P<date>\d{4}-\d{2}-\d{2})$")
+
+
+def parse_maintenance(value):
+    """Split a maintenance_start/maintenance_end value into (segment, date).
+
+    Returns (None, None) for empty or malformed values.
+    """
+    m = _MAINT_RE.match(value) if value else None
+    return (m.group("segment"), m.group("date")) if m else (None, None)
+
+
+# Port numbers inside polatis_port_range, e.g. "In=123;Out=456"
+_IN_PORT_RE = re.compile(r"In=(\d+)")
+_OUT_PORT_RE = re.compile(r"Out=(\d+)")
+
 
 class DeviceType(Base):
     """Device type model - represents the type of device"""
@@ -166,11 +183,15 @@ class InventoryDevice(Base):
     device_type = relationship("DeviceType", back_populates="devices")
     manufacturer = relationship("Manufacturer", back_populates="devices")
     site = relationship("Site", back_populates="devices")
+    # passive_deletes: the ON DELETE CASCADE foreign keys remove these rows in
+    # one statement, instead of the ORM loading and deleting them one by one
     device_tags = relationship(
-        "InventoryDeviceTag", back_populates="device", cascade="all, delete-orphan"
+        "InventoryDeviceTag", back_populates="device", cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     history_entries = relationship(
-        "DeviceHistory", back_populates="device", cascade="all, delete-orphan"
+        "DeviceHistory", back_populates="device", cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     created_by = relationship(SchedulerUser, foreign_keys=[created_by_id])
     updated_by = relationship(SchedulerUser, foreign_keys=[updated_by_id])
@@ -215,13 +236,26 @@ class InventoryDevice(Base):
     #       raise ValueError(f"DeviceType '{value}' not found")
     #   device.device_type = device_type_obj
 
+    def _ports(self):
+        # Parse 'In=123;Out=456' into (in_port, out_port), caching the result
+        # on the instance keyed by the string it came from. A new
+        # polatis_port_range (setters included) fails the key check and reparses
+        port_range = self.polatis_port_range
+        cache = self.__dict__.get("_ports_cache")
+        if cache is not None and cache[0] == port_range:
+            return cache[1]
+        if port_range:
+            m_in = _IN_PORT_RE.search(port_range)
+            m_out = _OUT_PORT_RE.search(port_range)
+            ports = (int(m_in.group(1)) if m_in else 0, int(m_out.group(1)) if m_out else 0)
+        else:
+            ports = (0, 0)
+        self._ports_cache = (port_range, ports)
+        return ports
+
     @property
     def Out_Port(self):
-        # Parse 'In=123;Out=456'
-        if not self.polatis_port_range:
-            return 0
-        m = re.search(r"Out=(\d+)", self.polatis_port_range)
-        return int(m.group(1)) if m else 0
+        return self._ports()[1]
 
     @Out_Port.setter
     def Out_Port(self, value):
@@ -234,10 +268,7 @@ class InventoryDevice(Base):
 
     @property
     def In_Port(self):
-        if not self.polatis_port_range:
-            return 0
-        m = re.search(r"In=(\d+)", self.polatis_port_range)
-        return int(m.group(1)) if m else 0
+        return self._ports()[0]
 
     @In_Port.setter
     def In_Port(self, value):
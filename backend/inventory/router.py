@@ -2,8 +2,8 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, File, UploadFile
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import or_, and_, func, insert
 from typing import List, Optional
 from datetime import datetime
 import shutil
@@ -15,6 +15,15 @@ from backend.inventory.models import InventoryDevice, InventoryDeviceTag
 
 router = APIRouter()
 
+# Load everything _device_to_response reads up front, so listing N devices
+# costs a constant number of queries instead of several per device
+_DEVICE_RESPONSE_OPTIONS = (
+    joinedload(InventoryDevice.device_type),
+    joinedload(InventoryDevice.manufacturer),
+    joinedload(InventoryDevice.site),
+    selectinload(InventoryDevice.device_tags).joinedload(InventoryDeviceTag.tag),
+)
+
 
 def get_current_user_id(request: Request) -> Optional[int]:
     """Get current user ID from session"""
@@ -94,10 +103,11 @@ def create_device(
     db.add(db_device)
     db.commit()
     db.refresh(db_device)
+    device_id = db_device.id
     
     # Create history entry
     history = models.DeviceHistory(
-        device_id=db_device.id,
+        device_id=device_id,
         action="created",
         changed_by_id=user_id,
         notes=f"Device created: {db_device.name}",
@@ -105,7 +115,7 @@ def create_device(
     db.add(history)
     db.commit()
     
-    return _device_to_response(db_device, db)
+    return _device_to_response(_get_device_for_response(db, device_id), db)
 
 
 @router.get("/devices", response_model=schemas.DeviceListResponse)
@@ -161,7 +171,8 @@ def list_devices(
     
     # Apply pagination and ordering
     devices = (
-        query.order_by(InventoryDevice.created_at.desc())
+        query.options(*_DEVICE_RESPONSE_OPTIONS)
+        .order_by(InventoryDevice.created_at.desc())
         .offset(offset)
         .limit(limit)
         .all()
@@ -181,7 +192,7 @@ def get_device(
     db: Session = Depends(get_db),
 ):
     """Get a specific device by ID"""
-    device = db.query(InventoryDevice).get(device_id)
+    device = _get_device_for_response(db, device_id)
     if not device:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -197,7 +208,7 @@ def get_device_by_oi_id(
     db: Session = Depends(get_db),
 ):
     """Get a specific device by oi_id"""
-    device = db.query(InventoryDevice).filter(
+    device = db.query(InventoryDevice).options(*_DEVICE_RESPONSE_OPTIONS).filter(
         InventoryDevice.oi_id == oi_id
     ).first()
     if not device:
@@ -288,9 +299,8 @@ def update_device(
         db.add(history)
     
     db.commit()
-    db.refresh(db_device)
     
-    return _device_to_response(db_device, db)
+    return _device_to_response(_get_device_for_response(db, device_id), db)
 
 
 @router.delete("/devices/{device_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -339,46 +349,61 @@ def bulk_update_devices(
     # Get allowed fields from DeviceUpdate schema
     allowed_fields = set(schemas.DeviceUpdate.__fields__.keys())
     
+    # The same values apply to every device, so resolve them once
+    values = {}
+    rejected_fields = []
+    for field, value in request_data.updates.items():
+        if field not in allowed_fields:
+            rejected_fields.append(field)
+            continue
+        
+        if field in InventoryDevice.__table__.columns:
+            # Handle status enum conversion
+            if field == "status" and isinstance(value, schemas.DeviceStatus):
+                value = value.value
+            # Handle mgmt_ip conversion
+            if field == "mgmt_ip" and value is not None:
+                value = str(value)
+            values[field] = value
+    values["updated_by_id"] = user_id
+    
+    existing_ids = {
+        device_id
+        for (device_id,) in db.query(InventoryDevice.id).filter(
+            InventoryDevice.id.in_(request_data.device_ids)
+        )
+    }
+    
     for device_id in request_data.device_ids:
-        try:
-            db_device = db.query(InventoryDevice).get(device_id)
-            if not db_device:
-                failed.append({"device_id": device_id, "error": "Device not found"})
-                continue
-            
-            # Apply updates only for allowed fields
-            for field, value in request_data.updates.items():
-                if field not in allowed_fields:
-                    failed.append({
-                        "device_id": device_id,
-                        "error": f"Field '{field}' is not allowed for update"
-                    })
-                    continue
-                
-                if hasattr(db_device, field):
-                    # Handle status enum conversion
-                    if field == "status" and isinstance(value, schemas.DeviceStatus):
-                        value = value.value
-                    # Handle mgmt_ip conversion
-                    if field == "mgmt_ip" and value is not None:
-                        value = str(value)
-                    setattr(db_device, field, value)
-            
-            db_device.updated_by_id = user_id
-            
-            # Create history entry
-            history = models.DeviceHistory(
-                device_id=db_device.id,
-                action="bulk_updated",
-                changed_by_id=user_id,
-                notes=f"Bulk update: {', '.join(request_data.updates.keys())}",
-                extra={"updates": request_data.updates},
-            )
-            db.add(history)
-            
-            succeeded.append(device_id)
-        except Exception as e:
-            failed.append({"device_id": device_id, "error": str(e)})
+        if device_id not in existing_ids:
+            failed.append({"device_id": device_id, "error": "Device not found"})
+            continue
+        for field in rejected_fields:
+            failed.append({
+                "device_id": device_id,
+                "error": f"Field '{field}' is not allowed for update"
+            })
+        succeeded.append(device_id)
+    
+    if existing_ids:
+        # One UPDATE and one multi-row history INSERT, however many devices
+        db.query(InventoryDevice).filter(InventoryDevice.id.in_(existing_ids)).update(
+            values, synchronize_session=False
+        )
+        notes = f"Bulk update: {', '.join(request_data.updates.keys())}"
+        db.execute(
+            insert(models.DeviceHistory),
+            [
+                {
+                    "device_id": device_id,
+                    "action": "bulk_updated",
+                    "changed_by_id": user_id,
+                    "notes": notes,
+                    "extra": {"updates": request_data.updates},
+                }
+                for device_id in succeeded
+            ],
+        )
     
     db.commit()
     
@@ -1054,15 +1079,21 @@ def get_inventory_summary(db: Session = Depends(get_db)):
 
 # ================== Helper Functions ==================
 
+def _get_device_for_response(db: Session, device_id: int) -> Optional[InventoryDevice]:
+    """Load a device with everything _device_to_response reads, refreshing any copy already in the session"""
+    return (
+        db.query(InventoryDevice)
+        .options(*_DEVICE_RESPONSE_OPTIONS)
+        .populate_existing()
+        .filter(InventoryDevice.id == device_id)
+        .first()
+    )
+
+
 def _device_to_response(device: InventoryDevice, db: Session) -> schemas.DeviceResponse:
     """Convert Device model to DeviceResponse schema"""
-    # Get tags for this device
-    device_tags = (
-        db.query(models.Tag)
-        .join(InventoryDeviceTag)
-        .filter(InventoryDeviceTag.device_id == device.id)
-        .all()
-    )
+    # Tags come through the relationship so list_devices can eager-load them
+    device_tags = [device_tag.tag for device_tag in device.device_tags]
     
     return schemas.DeviceResponse(
         id=device.id,
@@ -1089,7 +1120,7 @@ def _device_to_response(device: InventoryDevice, db: Session) -> schemas.DeviceR
         device_type_name=device.device_type.name if device.device_type else None,
         manufacturer_name=device.manufacturer.name if device.manufacturer else None,
         site_name=device.site.name if device.site else None,
-        tags=[schemas.TagResponse(**tag.__dict__) for tag in device_tags],
+        tags=[schemas.TagResponse.from_orm(tag) for tag in device_tags],
     )
 
 
@@ -1158,11 +1189,10 @@ def upload_attachment(
     )
     db.add(attachment)
     db.commit()
-    db.refresh(device)
     
     # History
     history = models.DeviceHistory(
-        device_id=device.id,
+        device_id=device_id,
         action="attachment_added",
         changed_by_id=user_id,
         notes=f"Added attachment: {file.filename}"
@@ -1170,7 +1200,7 @@ def upload_attachment(
     db.add(history)
     db.commit()
     
-    return _device_to_response(device, db)
+    return _device_to_response(_get_device_for_response(db, device_id), db)
 
 @router.delete("/attachments/{attachment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_attachment(
@@ -55,7 +55,7 @@ from backend.core.discord_utils import send_booking_created_notification
 
 # Import inventory management router
 from backend.inventory.router import router as inventory_router
-from backend.inventory import models as inventory_models  # noqa: F401
+from backend.inventory import models as inventory_models
 
 _TZ = ZoneInfo("Europe/Dublin")
 
@@ -139,6 +139,11 @@ app.add_middleware(
 # Database dependency is now imported from deps.py
 
 
+def current_time() -> datetime:
+    """Wall-clock time used for booking expiry (tests patch this to freeze it)"""
+    return datetime.now()
+
+
 def _resolve_collaborators(
     db: Session, owner_username: str, collaborator_usernames: List[str]
 ) -> tuple[List[str], List[models.User]]:
@@ -1312,7 +1317,7 @@ def get_user_bookings(
         raise HTTPException(status_code=404, detail="User not found")
 
     # Update the status of devices that are already expired but have not been updated
-    now = datetime.now()
+    now = current_time()
     db.query(models.Booking).filter(
         models.Booking.user_id == user_id,
         models.Booking.end_time < now,
@@ -1628,7 +1633,7 @@ def delete_booking(booking_id: int, db: Session = Depends(get_db)):
 @app.get("/bookings/for-week")
 def get_bookings_for_week(start: str, db: Session = Depends(get_db)):
 
-    now = datetime.now()
+    now = current_time()
     db.query(models.Booking).filter(
         models.Booking.end_time < now,
         ~models.Booking.status.in_(["CANCELLED", "EXPIRED", "REJECTED"]),
@@ -1748,11 +1753,10 @@ def check_conflicts(req: schemas.ConflictCheckRequest, db: Session = Depends(get
         conflict_slots = []
 
         # Parse device.maintenance_start / device.maintenance_end
-        if device.maintenance_start and device.maintenance_end:
-            maint_start_date_str = device.maintenance_start.split("/")[
-                1
-            ]  # "2025-03-22"
-            maint_end_date_str = device.maintenance_end.split("/")[1]  # "2025-03-22"
+        # ("All Day/2025-03-22"); malformed values are treated as unset
+        _, maint_start_date_str = inventory_models.parse_maintenance(device.maintenance_start)
+        _, maint_end_date_str = inventory_models.parse_maintenance(device.maintenance_end)
+        if maint_start_date_str and maint_end_date_str:
             # parse them
             maint_start = datetime.strptime(maint_start_date_str, "%Y-%m-%d")
             maint_end = datetime.strptime(maint_end_date_str, "%Y-%m-%d")
@@ -10,6 +10,7 @@ from sqlalchemy import (
     Text,
     Boolean,
     JSON,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -85,6 +86,12 @@ class Booking(Base):
     device = relationship("Device", back_populates="bookings")
     user = relationship("User", back_populates="bookings")
 
+    # Time-window lookups (start_time < :end AND end_time > :start) range-scan
+    # this index; device_id/user_id ride along so the join keys need no row fetch
+    __table_args__ = (
+        Index("ix_booking_window", "start_time", "end_time", "device_id", "user_id"),
+    )
+
 
 class BookingFavorite(Base):
     __tablename__ = "booking_favorite"
@@ -12,10 +12,12 @@ from backend.core.discord_utils import send_admin_action_notification
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
-"""
-The secret key for admin registration 
-"""
-ADMIN_SECRET = os.getenv("ADMIN_SECRET", "")
+def _admin_secret() -> str:
+    """
+    The secret key for admin registration (read per request so changes to
+    ADMIN_SECRET apply without reloading the module)
+    """
+    return os.getenv("ADMIN_SECRET", "")
 
 
 # ================== Admin Register ==================
@@ -23,7 +25,7 @@ ADMIN_SECRET = os.getenv("ADMIN_SECRET", "")
 def admin_register(admin: schemas.AdminCreate, db: Session = Depends(get_db), request: Request = None):
 
     # Check secret key 
-    if admin.admin_secret != ADMIN_SECRET:
+    if admin.admin_secret != _admin_secret():
         raise HTTPException(status_code=403, detail="Invalid admin secret")
     
      # Check the user name 
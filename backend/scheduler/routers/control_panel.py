@@ -1,4 +1,6 @@
+import copy
 import os
+from functools import lru_cache
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 import yaml
@@ -18,26 +20,46 @@ from raritan.rpc import pdumodel, peripheral
 
 router = APIRouter(prefix="/control-panel", tags=["control-panel"])
 
-CONFIG_PATH = os.getenv("PDU_CONFIG_PATH", "config.yaml")
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader/dumper are much faster than the pure-Python ones
+if yaml.__with_libyaml__:
+    _YamlLoader, _YamlDumper = yaml.CSafeLoader, yaml.CSafeDumper
+else:
+    logger.warning("PyYAML was built without libyaml; PDU config will use the slow pure-Python parser")
+    _YamlLoader, _YamlDumper = yaml.SafeLoader, yaml.SafeDumper
+
 # Database dependency is now imported from deps.py
 
 
+def config_path() -> str:
+    """PDU config file location, read per call so it can change at runtime"""
+    return os.getenv("PDU_CONFIG_PATH", "config.yaml")
+
+
+@lru_cache(maxsize=8)
+def _parse_config(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse one version of the config file (keyed by mtime/size)"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def load_config():
     """ Load PDU Config file """
     try:
-        with open(CONFIG_PATH, 'r') as f:
-            config = yaml.safe_load(f)
+        path = config_path()
+        stat = os.stat(path)
+        # Callers mutate the result, so hand out a copy of the cached parse
+        config = copy.deepcopy(_parse_config(path, stat.st_mtime_ns, stat.st_size))
+        
+        # Create Sensor Object
+        for pdu_config in config.get('pdus', []):
+            sensors_config = pdu_config.get('sensors', [])
+            pdu_config['sensors'] = [Sensor(**sensor) for sensor in sensors_config]
             
-            # Create Sensor Object
-            for pdu_config in config.get('pdus', []):
-                sensors_config = pdu_config.get('sensors', [])
-                pdu_config['sensors'] = [Sensor(**sensor) for sensor in sensors_config]
-                
-            return config
+        return config
     except Exception as e:
         logger.error(f"Failed to load config: {e}")
         raise HTTPException(status_code=500, detail="Failed to load configuration")
@@ -50,8 +72,9 @@ def save_config(config):
             sensors = pdu_config.get('sensors', [])
             pdu_config['sensors'] = [sensor.dict() for sensor in sensors]
             
-        with open(CONFIG_PATH, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        with open(config_path(), 'w') as f:
+            yaml.dump(config, f, Dumper=_YamlDumper, default_flow_style=False)
+        _parse_config.cache_clear()
     except Exception as e:
         logger.error(f"Failed to save config: {e}")
         raise HTTPException(status_code=500, detail="Failed to save configuration")
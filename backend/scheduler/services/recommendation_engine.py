@@ -10,20 +10,60 @@ Provides fit-score based device recommendations using:
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select, bindparam
 from collections import defaultdict
 # Phase U2: Import InventoryDevice for unified device management
 from backend.inventory.models import InventoryDevice
 from backend.scheduler import models
 import statistics
 import math
+import itertools
+
+
+# Statements are built once at import and executed with bound parameters, so
+# the hot per-device lookups skip ORM query construction on every call.
+_Booking = models.Booking
+_ACTIVE_STATUSES = ['PENDING', 'CONFIRMED', 'CONFLICTING']
+
+_HISTORY_STMT = select(_Booking.status, _Booking.start_time, _Booking.end_time).where(
+    _Booking.start_time >= bindparam('cutoff')
+)
+_HISTORY_BY_DEVICE_STMT = _HISTORY_STMT.where(_Booking.device_id == bindparam('device_id'))
+_HISTORY_BY_TYPE_STMT = _HISTORY_STMT.join(models.Device).where(
+    models.Device.deviceType == bindparam('device_type')
+)
+
+_OVERLAPPING_BOOKING_STMT = select(_Booking.booking_id).where(
+    _Booking.device_id == bindparam('device_id'),
+    _Booking.end_time > bindparam('start'),
+    _Booking.start_time < bindparam('end'),
+    _Booking.status.in_(_ACTIVE_STATUSES),
+).limit(1)
+
+_DENSITY_SPANS_STMT = select(_Booking.start_time, _Booking.end_time).where(
+    _Booking.device_id == bindparam('device_id'),
+    _Booking.start_time >= bindparam('start'),
+    _Booking.end_time <= bindparam('end'),
+    _Booking.status.in_(['CONFIRMED', 'PENDING']),
+)
+
+_WINDOW_SPANS_STMT = select(_Booking.start_time, _Booking.end_time).where(
+    _Booking.device_id == bindparam('device_id'),
+    _Booking.end_time > bindparam('from_time'),
+    _Booking.end_time <= bindparam('window_end'),
+    _Booking.status.in_(_ACTIVE_STATUSES),
+).order_by(_Booking.start_time.asc())
 
 
 class RecommendationEngine:
     """Provides recommendations and predictions based on historical data"""
     
+    # Mappings scored with the DB-backed helpers per suggestion request
+    MAX_SUGGESTION_CANDIDATES = 20
+    
     def __init__(self, db: Session):
         self.db = db
+        self.suggestions_truncated = False
     
     def record_booking_outcome(self, booking_id: int, outcome: str, performance_metrics: Dict = None):
         """
@@ -42,30 +82,32 @@ class RecommendationEngine:
     
     def get_historical_booking_stats(self, device_id: Optional[int] = None, 
                                     device_type: Optional[str] = None,
-                                    days_back: int = 90) -> Dict:
+                                    days_back: int = 90,
+                                    now: Optional[datetime] = None) -> Dict:
         """
         Get historical booking statistics for devices.
         
+        `now` anchors the look-back window; callers scoring many devices pass
+        one shared value instead of reading the clock per call.
+        
         Returns statistics like:
         - success_rate: % of CONFIRMED bookings
         - cancellation_rate: % of CANCELLED bookings
         - average_duration: average booking duration
         - conflict_rate: % of CONFLICTING bookings
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-        
-        query = self.db.query(models.Booking).filter(
-            models.Booking.start_time >= cutoff_date
-        )
+        cutoff_date = (now or datetime.utcnow()) - timedelta(days=days_back)
         
         if device_id:
-            query = query.filter(models.Booking.device_id == device_id)
+            bookings = self.db.execute(
+                _HISTORY_BY_DEVICE_STMT, {'cutoff': cutoff_date, 'device_id': device_id}
+            ).all()
         elif device_type:
-            query = query.join(models.Device).filter(
-                models.Device.deviceType == device_type
-            )
-        
-        bookings = query.all()
+            bookings = self.db.execute(
+                _HISTORY_BY_TYPE_STMT, {'cutoff': cutoff_date, 'device_type': device_type}
+            ).all()
+        else:
+            bookings = self.db.execute(_HISTORY_STMT, {'cutoff': cutoff_date}).all()
         
         if not bookings:
             return {
@@ -106,15 +148,16 @@ class RecommendationEngine:
     
     def predict_fit_score_adjustment(self, device_id: int, device_type: str, 
                                      base_fit_score: float, date_range_start: datetime,
-                                     date_range_end: datetime) -> Tuple[float, str]:
+                                     date_range_end: datetime,
+                                     now: Optional[datetime] = None) -> Tuple[float, str]:
         """
         Predict fit_score adjustment based on historical data.
         
         Returns: (adjusted_score, explanation)
         """
         # Get historical stats
-        device_stats = self.get_historical_booking_stats(device_id=device_id, days_back=90)
-        type_stats = self.get_historical_booking_stats(device_type=device_type, days_back=90)
+        device_stats = self.get_historical_booking_stats(device_id=device_id, days_back=90, now=now)
+        type_stats = self.get_historical_booking_stats(device_type=device_type, days_back=90, now=now)
         
         # Combine device-specific and type-specific reliability
         device_reliability = device_stats.get('reliability_score', 0.5)
@@ -254,11 +297,8 @@ class RecommendationEngine:
             return False
         
         # Check bookings
-        overlapping = self.db.query(models.Booking).filter(
-            models.Booking.device_id == device.id,
-            models.Booking.end_time > start,
-            models.Booking.start_time < end,
-            models.Booking.status.in_(['PENDING', 'CONFIRMED', 'CONFLICTING']),
+        overlapping = self.db.execute(
+            _OVERLAPPING_BOOKING_STMT, {'device_id': device.id, 'start': start, 'end': end}
         ).first()
         
         return overlapping is None
@@ -270,11 +310,9 @@ class RecommendationEngine:
         historical_start = start - timedelta(days=window_days * 2)
         historical_end = end - timedelta(days=window_days)
         
-        bookings = self.db.query(models.Booking).filter(
-            models.Booking.device_id == device_id,
-            models.Booking.start_time >= historical_start,
-            models.Booking.end_time <= historical_end,
-            models.Booking.status.in_(['CONFIRMED', 'PENDING']),
+        bookings = self.db.execute(
+            _DENSITY_SPANS_STMT,
+            {'device_id': device_id, 'start': historical_start, 'end': historical_end},
         ).all()
         
         if not bookings:
@@ -300,28 +338,31 @@ class RecommendationEngine:
         # Get all bookings in the window
         window_end = from_time + timedelta(days=window_days)
         
-        bookings = self.db.query(models.Booking).filter(
-            models.Booking.device_id == device_id,
-            models.Booking.end_time > from_time,
-            models.Booking.end_time <= window_end,
-            models.Booking.status.in_(['PENDING', 'CONFIRMED', 'CONFLICTING']),
-        ).order_by(models.Booking.end_time.asc()).all()
+        spans = self.db.execute(
+            _WINDOW_SPANS_STMT,
+            {'device_id': device_id, 'from_time': from_time, 'window_end': window_end},
+        ).all()
         
-        if not bookings:
+        if not spans:
+            return from_time
+        
+        starts = [start for start, _ in spans]
+        if from_time < starts[0]:
             return from_time
         
+        # Merge the busy intervals: running_end[i] is the latest end time of
+        # bookings 0..i, so a gap opens before booking i+1 when it starts later
+        running_end = list(itertools.accumulate((end for _, end in spans), max))
+        gap_start = next(
+            (prev_end for start, prev_end in zip(starts[1:], running_end) if start > prev_end),
+            None,
+        )
+        if gap_start is not None:
+            return gap_start
+        
         # Check if there's a gap after the last booking
-        last_booking_end = max(b.end_time for b in bookings)
-        if last_booking_end < window_end:
-            return last_booking_end + timedelta(minutes=1)
-        
-        # Check for gaps between bookings
-        current_time = from_time
-        for booking in bookings:
-            if current_time < booking.start_time:
-                # Found a gap
-                return current_time
-            current_time = max(current_time, booking.end_time)
+        if running_end[-1] < window_end:
+            return running_end[-1] + timedelta(minutes=1)
         
         return None  # No available slot found
     
@@ -329,7 +370,8 @@ class RecommendationEngine:
                                        logical_edges: List[Dict],
                                        date_range_start: datetime,
                                        date_range_end: datetime,
-                                       base_mappings: List[Dict]) -> List[Dict]:
+                                       base_mappings: List[Dict],
+                                       max_candidates: Optional[int] = None) -> List[Dict]:
         """
         Suggest optimized topology configurations based on:
         - Performance predictions
@@ -337,14 +379,35 @@ class RecommendationEngine:
         - Resource efficiency
         - Historical reliability
         
+        Only the top `max_candidates` mappings by raw fit score are scored
+        against booking history; `suggestions_truncated` is set when some
+        were dropped.
+        
         Returns ranked list of suggested configurations with rationale.
         """
         suggestions = []
+        self.suggestions_truncated = False
+        now = datetime.utcnow()
+        
+        if not base_mappings:
+            return suggestions
+        
+        # Cheap pre-filter: rank by raw fit score (no DB) before running the
+        # history/availability lookups, which query once per node
+        if max_candidates is None:
+            max_candidates = self.MAX_SUGGESTION_CANDIDATES
+        if len(base_mappings) > max_candidates:
+            base_mappings = sorted(
+                base_mappings,
+                key=lambda m: self._calculate_performance_score(m, logical_nodes),
+                reverse=True,
+            )[:max_candidates]
+            self.suggestions_truncated = True
         
         for mapping in base_mappings:
             # Apply fit score adjustments based on historical data
             adjusted_mapping = self._apply_fit_score_adjustments(
-                mapping, date_range_start, date_range_end
+                mapping, date_range_start, date_range_end, now=now
             )
             
             # Calculate various metrics
@@ -353,7 +416,7 @@ class RecommendationEngine:
                 adjusted_mapping, date_range_start, date_range_end
             )
             efficiency_score = self._calculate_efficiency_score(adjusted_mapping, logical_nodes)
-            reliability_score = self._calculate_reliability_score(adjusted_mapping)
+            reliability_score = self._calculate_reliability_score(adjusted_mapping, now=now)
             
             # Combined recommendation score
             recommendation_score = (
@@ -393,15 +456,17 @@ class RecommendationEngine:
     
     def _apply_fit_score_adjustments(self, mapping: Dict, 
                                      date_range_start: datetime,
-                                     date_range_end: datetime) -> Dict:
+                                     date_range_end: datetime,
+                                     now: Optional[datetime] = None) -> Dict:
         """
         Apply fit score adjustments to node mappings based on historical data.
         
-        Updates fit scores and explanations for each node mapping.
+        Updates fit scores and explanations for each node mapping in place;
+        only the top-level mapping dict is copied.
         """
-        adjusted_node_mappings = []
+        node_mappings = mapping.get('node_mappings', [])
         
-        for nm in mapping.get('node_mappings', []):
+        for nm in node_mappings:
             device_id = nm.get('physical_device_id')
             device_type = nm.get('physical_device_type', '')
             base_fit_score = nm.get('fit_score', 0.0)
@@ -410,31 +475,26 @@ class RecommendationEngine:
                 # Get adjusted fit score
                 adjusted_score, explanation = self.predict_fit_score_adjustment(
                     device_id, device_type, base_fit_score,
-                    date_range_start, date_range_end
+                    date_range_start, date_range_end, now=now
                 )
                 
                 # Update the mapping
-                adjusted_nm = nm.copy()
-                adjusted_nm['fit_score'] = adjusted_score
+                nm['fit_score'] = adjusted_score
                 if explanation:
                     # Append to existing explanation
                     existing_explanation = nm.get('explanation', '')
-                    adjusted_nm['explanation'] = f"{existing_explanation} | {explanation}" if existing_explanation else explanation
-                
-                adjusted_node_mappings.append(adjusted_nm)
-            else:
-                adjusted_node_mappings.append(nm)
+                    nm['explanation'] = f"{existing_explanation} | {explanation}" if existing_explanation else explanation
         
         # Recalculate total fit score
-        node_scores = [nm['fit_score'] for nm in adjusted_node_mappings]
+        node_scores = [nm['fit_score'] for nm in node_mappings]
         link_scores = [lm.get('fit_score', 0.0) for lm in mapping.get('link_mappings', [])]
         total_fit_score = (
             (sum(node_scores) / len(node_scores) if node_scores else 0) * 0.7 +
             (sum(link_scores) / len(link_scores) if link_scores else 0) * 0.3
         )
         
-        adjusted_mapping = mapping.copy()
-        adjusted_mapping['node_mappings'] = adjusted_node_mappings
+        adjusted_mapping = dict(mapping)
+        adjusted_mapping['node_mappings'] = node_mappings
         adjusted_mapping['total_fit_score'] = round(total_fit_score, 2)
         
         return adjusted_mapping
@@ -475,7 +535,7 @@ class RecommendationEngine:
         efficiency = 1.0 - (unique_devices / total_nodes - 0.5) * 0.5 if total_nodes > 0 else 0.0
         return max(0.0, min(1.0, efficiency))
     
-    def _calculate_reliability_score(self, mapping: Dict) -> float:
+    def _calculate_reliability_score(self, mapping: Dict, now: Optional[datetime] = None) -> float:
         """Calculate reliability score based on historical data"""
         node_mappings = mapping.get('node_mappings', [])
         if not node_mappings:
@@ -487,10 +547,10 @@ class RecommendationEngine:
             device_type = nm.get('physical_device_type', '')
             
             if device_id:
-                stats = self.get_historical_booking_stats(device_id=device_id, days_back=90)
+                stats = self.get_historical_booking_stats(device_id=device_id, days_back=90, now=now)
                 reliability_scores.append(stats.get('reliability_score', 0.5))
             elif device_type:
-                stats = self.get_historical_booking_stats(device_type=device_type, days_back=90)
+                stats = self.get_historical_booking_stats(device_type=device_type, days_back=90, now=now)
                 reliability_scores.append(stats.get('reliability_score', 0.5))
             else:
                 reliability_scores.append(0.5)  # Default
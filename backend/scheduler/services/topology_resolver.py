@@ -9,24 +9,145 @@ This module implements a real topology-matching engine that:
 """
 
 import networkx as nx
-from typing import List, Dict, Optional, Tuple, Set
+from typing import List, Dict, Optional, Tuple, Set, FrozenSet, Callable
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, raiseload
 from sqlalchemy import and_, or_
 # Phase U2: Import InventoryDevice as Device for unified device management
-from backend.inventory.models import InventoryDevice as Device
+from backend.inventory.models import InventoryDevice as Device, parse_maintenance
 from backend.scheduler import models
 from collections import defaultdict
+from functools import lru_cache
+import heapq
 import itertools
 
 
+# Device types that can be physically connected, as unordered pairs:
+# ROADM can connect to Fiber, ILA, Transceiver, Switch
+# Fiber can connect to ROADM, ILA, OTDR
+# ILA can connect to Fiber, ROADM
+# Transceiver can connect to ROADM, Switch
+# Switch can connect to Transceiver, ROADM
+COMPATIBLE_PAIRS = frozenset(
+    tuple(sorted(pair)) for pair in [
+        ('roadm', 'fiber'), ('roadm', 'ila'), ('roadm', 'transceiver'), ('roadm', 'switch'),
+        ('fiber', 'ila'), ('fiber', 'otdr'),
+        ('transceiver', 'switch'),
+    ]
+)
+
+# Connectable device types as small integer ids; COMPAT_MASK[type_id] has bit
+# n set when that type can connect to the type with id n
+TYPE_ID = {device_type: i for i, device_type in enumerate(sorted(set(itertools.chain(*COMPATIBLE_PAIRS))))}
+
+
+def _build_compat_masks() -> List[int]:
+    masks = [0] * len(TYPE_ID)
+    for type1, type2 in COMPATIBLE_PAIRS:
+        masks[TYPE_ID[type1]] |= 1 << TYPE_ID[type2]
+        masks[TYPE_ID[type2]] |= 1 << TYPE_ID[type1]
+    return masks
+
+
+COMPAT_MASK = _build_compat_masks()
+
+
+# Logical parameters reported in the fit explanation, per device type. Vendor
+# and port counts are not stored on physical devices, so nothing checks them
+PARAM_CHECKS = {
+    'fiber': (('length', "Length: acceptable"),),
+    'ila': (('gain', "Gain: acceptable"),),
+}
+# Unknown device types get every check
+GENERIC_PARAM_CHECKS = tuple(itertools.chain(*PARAM_CHECKS.values()))
+
+
+def _make_param_factors(checks: Tuple[Tuple[str, str], ...]) -> Callable[[Dict], Tuple[str, ...]]:
+    """Attribute factors function running only `checks`"""
+    if not checks:
+        return lambda logical_params: ()
+    
+    def param_factors(logical_params: Dict) -> Tuple[str, ...]:
+        return tuple(label for param, label in checks if logical_params.get(param))
+    return param_factors
+
+
+# Specialised once per known type (by TYPE_ID) so explaining a candidate only
+# looks up the parameters relevant to its type
+PARAM_FACTORS_BY_TYPE_ID = {
+    type_id: _make_param_factors(PARAM_CHECKS.get(device_type, ()))
+    for device_type, type_id in TYPE_ID.items()
+}
+_generic_param_factors = _make_param_factors(GENERIC_PARAM_CHECKS)
+
+
+def _base_fit_score(available: bool, status_lc: str) -> float:
+    """Numeric fit of a device: 0.0 when unavailable or in maintenance, else 1.0"""
+    if not available or status_lc == 'maintenance':
+        return 0.0
+    return 1.0
+
+
+@lru_cache(maxsize=1024)
+def _parse_maintenance_date(value: str) -> Optional[datetime]:
+    """Parse a maintenance field (format: "Maintenance/2025-03-22"), None if invalid"""
+    # Devices share a handful of maintenance dates, so each distinct string
+    # is parsed once rather than once per device per graph build
+    # A bare date (no segment) is accepted as well
+    date_str = parse_maintenance(value)[1] or value
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _build_logical_adj(edges_key: Tuple[Tuple[str, str], ...]) -> Dict[str, FrozenSet[str]]:
+    """Logical node id -> ids of its logical neighbours"""
+    # Keyed on the sorted (source, target) pairs so the same topology resolved
+    # for several date ranges builds its adjacency once
+    logical_adj = defaultdict(set)
+    for source, target in edges_key:
+        logical_adj[source].add(target)
+        logical_adj[target].add(source)
+    return {node_id: frozenset(neighbors) for node_id, neighbors in logical_adj.items()}
+
+
+def _logical_edges_key(logical_edges: List[Dict]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((edge.get('source', ''), edge.get('target', '')) for edge in logical_edges))
+
+
+def _params_key(logical_params: Dict) -> str:
+    # Parameter values may be lists or dicts, so key on a stable repr
+    return repr(sorted(logical_params.items()))
+
+
 class TopologyResolver:
     """Resolves logical topologies to physical device mappings"""
     
+    # Candidates returned per match: the best device plus three alternatives
+    MATCH_TOP_K = 4
+    
     def __init__(self, db: Session):
         self.db = db
         self.physical_graph = None
-        self.device_cache = {}
+        # device_id -> node attributes of the current physical graph; matching
+        # reads this plain dict instead of going through the NetworkX node view
+        self.device_cache: Dict[int, Dict] = {}
+        # lowercased device type -> ids of devices available in the date range,
+        # filled by build_physical_graph and shared read-only by the strategies
+        self.available_by_type: Dict[str, Tuple[int, ...]] = {}
+        # Struct-of-arrays view of the node attributes read by the scoring
+        # pass: device_id -> dense index into the parallel lists below
+        self._dev_index: Dict[int, int] = {}
+        # lowercased device type -> ids of all devices of that type
+        self._device_ids_by_type: Dict[str, frozenset] = {}
+        self._node_base_score: List[float] = []
+        # (logical node id, type, params, has edges, candidate ids, full) ->
+        # ranked candidates; the strategies match the same nodes against the
+        # same pools. The fit factors depend on the type, params and edges,
+        # so those are part of the key in case two nodes share an id
+        self._match_cache: Dict[Tuple[str, str, str, bool, frozenset, bool], List[Dict]] = {}
         
     def build_physical_graph(self, date_range_start: datetime, date_range_end: datetime) -> nx.Graph:
         """
@@ -41,81 +162,113 @@ class TopologyResolver:
         - device attributes (ports, IP, status)
         """
         G = nx.Graph()
+        self.device_cache = {}
+        self._match_cache.clear()
         
         # Phase U2: Query all devices with eager loading
-        devices = self.db.query(Device).options(joinedload(Device.device_type)).all()
+        # device_type is many-to-one, so a joined load adds no duplicate rows;
+        # every other relationship raises instead of lazy-loading per device
+        devices = (
+            self.db.query(Device)
+            .options(joinedload(Device.device_type), raiseload('*'))
+            .all()
+        )
         
-        # Query all active bookings for the date range
-        overlapping_bookings = (
-            self.db.query(models.Booking)
+        # Devices with an active booking overlapping the date range
+        busy_device_ids = {
+            device_id
+            for (device_id,) in self.db.query(models.Booking.device_id)
             .filter(
                 models.Booking.end_time > date_range_start,
                 models.Booking.start_time < date_range_end,
                 models.Booking.status.in_(["PENDING", "CONFIRMED", "CONFLICTING"]),
             )
-            .all()
-        )
+            .distinct()
+        }
         
-        # Build booking map: device_id -> list of booking time ranges
-        device_bookings = defaultdict(list)
-        for booking in overlapping_bookings:
-            device_bookings[booking.device_id].append((booking.start_time, booking.end_time))
+        # Device ids bucketed by lowercased type, used to generate edges
+        type_buckets = defaultdict(list)
+        available_by_type = defaultdict(list)
+        dev_index = {}
+        node_base_score = []
+        # Nodes are collected and inserted in one add_nodes_from call
+        nodes_batch = []
         
         # Add devices as nodes
         for device in devices:
             # Check if device is available in the date range
             is_available = self._check_device_availability(
-                device, date_range_start, date_range_end, device_bookings.get(device.id, [])
+                device, device.id in busy_device_ids
             )
             
             # Check maintenance
             in_maintenance = self._check_maintenance(device, date_range_start, date_range_end)
             
             # Device attributes
+            device_type = device.deviceType or 'Unknown'
+            status = device.status or 'Available'
             device_attrs = {
                 'device_id': device.id,
-                'device_type': device.deviceType or 'Unknown',
+                'device_type': device_type,
+                # Lowercased once here so matching never re-lowers per candidate
+                'device_type_lc': device_type.strip().lower(),
+                'type_id': TYPE_ID.get(device_type.strip().lower(), -1),
                 'device_name': device.deviceName or f'Device-{device.id}',
                 'ip_address': device.ip_address,
-                'status': device.status or 'Available',
+                'status': status,
+                'status_lc': status.lower(),
                 'out_port': device.Out_Port,
                 'in_port': device.In_Port,
                 'available': is_available and not in_maintenance,
                 'in_maintenance': in_maintenance,
-                'bookings': device_bookings.get(device.id, []),
             }
+            # The numeric score depends only on the device, so compute it once
+            # here instead of per logical node per strategy
+            device_attrs['base_fit_score'] = _base_fit_score(
+                device_attrs['available'], device_attrs['status_lc']
+            )
             
-            G.add_node(device.id, **device_attrs)
+            nodes_batch.append((device.id, device_attrs))
             self.device_cache[device.id] = device_attrs
+            type_buckets[device_attrs['device_type_lc']].append(device.id)
+            if device_attrs['available']:
+                available_by_type[device_attrs['device_type_lc']].append(device.id)
+            
+            dev_index[device.id] = len(node_base_score)
+            node_base_score.append(device_attrs['base_fit_score'])
+        
+        G.add_nodes_from(nodes_batch)
         
         # Build edges based on port connections
         # If device A's Out_Port connects to device B's In_Port, create an edge
         # For now, we'll create edges for devices that could potentially connect
         # In a real system, you might have explicit connection mappings
-        device_nodes = list(G.nodes(data=True))
-        for i, (dev_id1, attrs1) in enumerate(device_nodes):
-            for dev_id2, attrs2 in device_nodes[i+1:]:
-                # Simple heuristic: if devices have matching port types or are same type, they can connect
-                # You might want to refine this based on actual physical topology
-                if self._can_connect(attrs1, attrs2):
-                    G.add_edge(dev_id1, dev_id2, weight=1.0)
+        # Every device of one type connects to every device of a compatible
+        # type, so walk the compatible type pairs rather than all device pairs
+        edges_batch = itertools.chain.from_iterable(
+            itertools.product(type_buckets.get(type1, ()), type_buckets.get(type2, ()))
+            for type1, type2 in COMPATIBLE_PAIRS
+        )
+        G.add_edges_from(edges_batch, weight=1.0)
         
+        self.available_by_type = {
+            device_type: tuple(device_ids) for device_type, device_ids in available_by_type.items()
+        }
+        self._dev_index = dev_index
+        self._device_ids_by_type = {
+            device_type: frozenset(device_ids) for device_type, device_ids in type_buckets.items()
+        }
+        self._node_base_score = node_base_score
         self.physical_graph = G
         return G
     
-    def _check_device_availability(self, device: models.Device, start: datetime, end: datetime, bookings: List[Tuple[datetime, datetime]]) -> bool:
-        """Check if device is available in the given time range"""
+    def _check_device_availability(self, device: models.Device, is_busy: bool) -> bool:
+        """Check if device is available, given whether it is booked in the time range"""
         # Check if device status is available
         if device.status and device.status.lower() in ['maintenance', 'unavailable', 'broken']:
             return False
         
-        # Check bookings for conflicts
-        for booking_start, booking_end in bookings:
-            # Check for overlap
-            if not (booking_end <= start or booking_start >= end):
-                return False  # Device is booked during this time
-        
-        return True
+        return not is_busy
     
     def _check_maintenance(self, device: models.Device, start: datetime, end: datetime) -> bool:
         """Check if device is in maintenance during the time range"""
@@ -123,19 +276,16 @@ class TopologyResolver:
             return True
         
         if device.maintenance_start and device.maintenance_end:
-            try:
-                # Parse maintenance dates (format: "Maintenance/2025-03-22")
-                maint_start_str = device.maintenance_start.split("/")[-1] if "/" in device.maintenance_start else device.maintenance_start
-                maint_end_str = device.maintenance_end.split("/")[-1] if "/" in device.maintenance_end else device.maintenance_end
-                
-                maint_start = datetime.strptime(maint_start_str, "%Y-%m-%d")
-                maint_end = datetime.strptime(maint_end_str, "%Y-%m-%d")
-                
-                # Check for overlap
-                if not (maint_end < start or maint_start > end):
-                    return True
-            except (ValueError, AttributeError):
-                pass  # Invalid date format, skip
+            maint_start = _parse_maintenance_date(device.maintenance_start)
+            maint_end = _parse_maintenance_date(device.maintenance_end)
+            
+            # Invalid date format, skip
+            if maint_start is None or maint_end is None:
+                return False
+            
+            # Check for overlap
+            if not (maint_end < start or maint_start > end):
+                return True
         
         return False
     
@@ -144,33 +294,47 @@ class TopologyResolver:
         # Simple heuristic: devices of compatible types can connect
         # You might want to refine this based on actual physical topology
         
-        type1 = attrs1.get('device_type', '').lower()
-        type2 = attrs2.get('device_type', '').lower()
+        type_id1 = attrs1.get('type_id')
+        if type_id1 is None:
+            type_id1 = TYPE_ID.get(attrs1.get('device_type', '').lower(), -1)
+        type_id2 = attrs2.get('type_id')
+        if type_id2 is None:
+            type_id2 = TYPE_ID.get(attrs2.get('device_type', '').lower(), -1)
         
-        # ROADM can connect to Fiber, ILA, Transceiver
-        # Fiber can connect to ROADM, ILA, OTDR
-        # ILA can connect to Fiber, ROADM
-        # Transceiver can connect to ROADM, Switch
-        # Switch can connect to Transceiver, ROADM
-        
-        compatible_pairs = [
-            ('roadm', 'fiber'), ('roadm', 'ila'), ('roadm', 'transceiver'), ('roadm', 'switch'),
-            ('fiber', 'roadm'), ('fiber', 'ila'), ('fiber', 'otdr'),
-            ('ila', 'fiber'), ('ila', 'roadm'),
-            ('transceiver', 'roadm'), ('transceiver', 'switch'),
-            ('switch', 'transceiver'), ('switch', 'roadm'),
-        ]
-        
-        return (type1, type2) in compatible_pairs or (type2, type1) in compatible_pairs
+        # Types outside the compatibility table never connect
+        if type_id1 < 0 or type_id2 < 0:
+            return False
+        return (COMPAT_MASK[type_id1] >> type_id2) & 1 == 1
     
     def match_logical_node(self, logical_node: Dict, available_devices: List[int], 
-                          logical_edges: List[Dict] = None) -> List[Dict]:
+                          logical_edges: List[Dict] = None, full: bool = False) -> List[Dict]:
         """
         Find matching physical devices for a logical node.
         
-        Returns list of candidate devices with fit scores and explanations.
+        Returns the MATCH_TOP_K best candidate devices with fit scores and
+        explanations, or every candidate ranked when `full` is set.
+        """
+        logical_type_lc = logical_node.get('deviceType', '').strip().lower()
+        devices_of_type = self._device_ids_by_type.get(logical_type_lc, frozenset())
+        candidate_device_ids = [d for d in available_devices if d in devices_of_type]
+        
+        matches = self._match_logical_node_typed(logical_node, candidate_device_ids, logical_edges, full=full)
+        return [self._explain_candidate(match) for match in matches]
+    
+    def _match_logical_node_typed(self, logical_node: Dict, candidate_device_ids: List[int],
+                                  logical_edges: List[Dict] = None, full: bool = False) -> List[Dict]:
+        """
+        match_logical_node for callers whose candidates are already of the
+        logical node's type (the strategies pass available_by_type buckets),
+        so no per-device type comparison is made.
+        
+        Candidates carry their fit 'factors' rather than a joined explanation;
+        callers run _explain_candidate on the few they keep.
+        
+        Results are cached per logical node (id, type and parameters) and
+        candidate pool until the physical graph is rebuilt. Callers get fresh candidate dicts, so they
+        may adjust scores without touching the cache.
         """
-        logical_type = logical_node.get('deviceType', '').strip()
         logical_params = logical_node.get('parameters', {})
         logical_id = logical_node.get('id', '')
         
@@ -179,48 +343,69 @@ class TopologyResolver:
         if not self.physical_graph:
             return candidates
         
-        # Get devices that match the type and are available
-        for device_id in available_devices:
-            if device_id not in self.physical_graph:
-                continue
-                
-            device_attrs = self.physical_graph.nodes[device_id]
-            physical_type = (device_attrs.get('device_type') or '').strip()
-            
-            # Type matching
-            if physical_type.lower() != logical_type.lower():
-                continue
-            
-            # Compute fit score
-            fit_score, explanation = self._compute_fit_score(
-                logical_node, device_attrs, logical_params, logical_edges
-            )
-            
+        cache_key = (
+            logical_id,
+            logical_node.get('deviceType', ''),
+            _params_key(logical_params),
+            bool(logical_edges),
+            frozenset(candidate_device_ids),
+            full,
+        ) if logical_id else None
+        cached = self._match_cache.get(cache_key)
+        if cached is not None:
+            return [dict(candidate) for candidate in cached]
+        
+        # Rank on the numeric scores first, then build dicts only for the
+        # candidates returned
+        scored = self._score_candidates(candidate_device_ids)
+        if full:
+            scored.sort(key=lambda x: x[1], reverse=True)
+        else:
+            scored = heapq.nlargest(self.MATCH_TOP_K, scored, key=lambda x: x[1])
+        
+        node_attrs = self.device_cache
+        for device_id, fit_score in scored:
+            device_attrs = node_attrs[device_id]
             candidates.append({
                 'device_id': device_id,
                 'device_name': device_attrs.get('device_name', f'Device-{device_id}'),
-                'device_type': physical_type,
+                'device_type': (device_attrs.get('device_type') or '').strip(),
                 'fit_score': fit_score,
-                'explanation': explanation,
+                'factors': self._fit_factors(device_attrs, logical_params, logical_edges),
                 'available': device_attrs.get('available', False),
             })
         
-        # Sort by fit score (descending)
-        candidates.sort(key=lambda x: x['fit_score'], reverse=True)
+        if cache_key is not None:
+            self._match_cache[cache_key] = candidates
+            return [dict(candidate) for candidate in candidates]
         return candidates
     
-    def _compute_fit_score(self, logical_node: Dict, physical_attrs: Dict, 
-                          logical_params: Dict, logical_edges: List[Dict] = None) -> Tuple[float, str]:
+    def _explain_candidate(self, candidate: Dict) -> Dict:
+        """Join a candidate's fit factors into its 'explanation' (in place)"""
+        factors = candidate.pop('factors', None)
+        if factors is not None:
+            candidate['explanation'] = " | ".join(factors)
+        return candidate
+    
+    def _score_candidates(self, device_ids: List[int]) -> List[Tuple[int, float]]:
         """
-        Compute fit score (0.0 to 1.0) and explanation for matching a logical node to a physical device.
-        
-        Factors:
-        1. Type match (required, 1.0 if match, 0.0 otherwise)
-        2. Availability (1.0 if available, 0.0 if not)
-        3. Attribute matching (vendor, ports, etc.)
-        4. Connection compatibility (if edges are specified)
+        Numeric core of matching: (device_id, fit_score) for every device in
+        the graph, in one pass with no strings or dicts built per device.
+        Callers have already filtered the devices by type.
         """
-        score = 1.0
+        dev_index = self._dev_index
+        node_base_score = self._node_base_score
+        
+        scored = []
+        for device_id in device_ids:
+            i = dev_index.get(device_id)
+            if i is not None:
+                scored.append((device_id, node_base_score[i]))
+        return scored
+    
+    def _fit_factors(self, physical_attrs: Dict, logical_params: Dict,
+                     logical_edges: List[Dict] = None) -> Tuple[str, ...]:
+        """Human-readable factors behind a device's fit score"""
         factors = []
         
         # Factor 1: Type match (already filtered, so always 1.0)
@@ -228,49 +413,24 @@ class TopologyResolver:
         
         # Factor 2: Availability
         if not physical_attrs.get('available', False):
-            score = 0.0
             factors.append("Availability: ✗ (not available in time range)")
-            return score, " | ".join(factors)
+            return tuple(factors)
         factors.append("Availability: ✓")
         
         # Factor 3: Status
-        status = physical_attrs.get('status', '').lower()
+        status = physical_attrs.get('status_lc', '')
         if status == 'available':
             factors.append("Status: ✓")
         elif status == 'maintenance':
-            score *= 0.0
             factors.append("Status: ✗ (maintenance)")
         else:
             factors.append(f"Status: {status}")
         
-        # Factor 4: Attribute matching
-        param_score = 1.0
-        param_factors = []
-        
-        # Vendor matching
-        if logical_params.get('vendor'):
-            # Physical devices don't store vendor in current schema, so skip for now
-            # In a real system, you'd compare vendor compatibility
-            pass
-        
-        # Port matching (for ROADM, Switch)
-        if logical_params.get('ports'):
-            logical_ports = int(logical_params.get('ports', 0))
-            # Physical devices have Out_Port and In_Port, but not total ports
-            # This is a limitation of current schema
-            pass
-        
-        # Length matching (for Fiber)
-        if logical_params.get('length'):
-            # Fiber length is a logical parameter, physical fiber has fixed length
-            # This could be used to filter, but for now we accept any fiber
-            param_factors.append("Length: acceptable")
-        
-        # Gain matching (for ILA)
-        if logical_params.get('gain'):
-            # ILA gain is a logical parameter, physical ILA has fixed gain
-            # This could be used to filter
-            param_factors.append("Gain: acceptable")
+        # Factor 4: Attribute matching (length for Fiber, gain for ILA; any
+        # fiber or ILA is accepted since physical devices have fixed values)
+        param_factors = PARAM_FACTORS_BY_TYPE_ID.get(
+            physical_attrs.get('type_id', -1), _generic_param_factors
+        )(logical_params)
         
         if param_factors:
             factors.append(f"Attributes: {' | '.join(param_factors)}")
@@ -283,7 +443,7 @@ class TopologyResolver:
             # For now, we assume connections are possible if devices are in the graph
             factors.append("Connections: compatible")
         
-        return score, " | ".join(factors)
+        return tuple(factors)
     
     def resolve_topology(self, logical_nodes: List[Dict], logical_edges: List[Dict],
                         date_range_start: datetime, date_range_end: datetime,
@@ -304,12 +464,8 @@ class TopologyResolver:
         if not physical_graph or len(physical_graph.nodes) == 0:
             return []
         
-        # Get available devices by type
-        available_by_type = defaultdict(list)
-        for node_id, attrs in physical_graph.nodes(data=True):
-            if attrs.get('available', False):
-                device_type = attrs.get('device_type', '').lower()
-                available_by_type[device_type].append(node_id)
+        # Get available devices by type (bucketed while building the graph)
+        available_by_type = self.available_by_type
         
         # Generate mapping options using different strategies
         mapping_options = []
@@ -337,32 +493,35 @@ class TopologyResolver:
         return mapping_options[:num_options]
     
     def _generate_greedy_mapping(self, logical_nodes: List[Dict], logical_edges: List[Dict],
-                                 available_by_type: Dict[str, List[int]], physical_graph: nx.Graph,
+                                 available_by_type: Dict[str, Tuple[int, ...]], physical_graph: nx.Graph,
                                  strategy_name: str) -> Optional[Dict]:
         """Generate mapping using greedy best-fit strategy"""
         node_mappings = []
         used_devices = set()
         
         for logical_node in logical_nodes:
-            logical_type = logical_node.get('deviceType', '').lower()
-            available_devices = available_by_type.get(logical_type, [])
+            logical_type = logical_node.get('deviceType', '').strip().lower()
+            available_devices = available_by_type.get(logical_type, ())
             
             # Filter out already used devices
-            candidates = [d for d in available_devices if d not in used_devices]
+            candidates = [d for d in available_devices if d not in used_devices] if used_devices else available_devices
             
             if not candidates:
                 # No available devices, try with used devices
                 candidates = available_devices
             
             # Get best match
-            matches = self.match_logical_node(logical_node, candidates, logical_edges)
+            matches = self._match_logical_node_typed(logical_node, candidates, logical_edges)
             
             if not matches:
                 # No match found, return None to indicate failure
                 return None
             
-            best_match = matches[0]
+            best_match = self._explain_candidate(matches[0])
             used_devices.add(best_match['device_id'])
+            # Shallow copies of the kept alternatives let the rest be freed
+            alternatives = [self._explain_candidate(dict(m)) for m in matches[1:4]]
+            del matches
             
             node_mappings.append({
                 'logical_node_id': logical_node.get('id', ''),
@@ -371,7 +530,7 @@ class TopologyResolver:
                 'physical_device_type': best_match['device_type'],
                 'fit_score': best_match['fit_score'],
                 'confidence': 'high' if best_match['fit_score'] >= 0.8 else 'medium' if best_match['fit_score'] >= 0.5 else 'low',
-                'alternatives': matches[1:4],  # Top 3 alternatives
+                'alternatives': alternatives,  # Top 3 alternatives
                 'explanation': best_match.get('explanation', ''),
             })
         
@@ -379,37 +538,32 @@ class TopologyResolver:
         link_mappings = self._generate_link_mappings(logical_edges, node_mappings, physical_graph)
         
         # Calculate total fit score
-        node_scores = [m['fit_score'] for m in node_mappings]
-        link_scores = [m['fit_score'] for m in link_mappings]
-        total_fit_score = (
-            (sum(node_scores) / len(node_scores) if node_scores else 0) * 0.7 +
-            (sum(link_scores) / len(link_scores) if link_scores else 0) * 0.3
-        )
+        total_fit_score = self._calculate_total_fit_score(node_mappings, link_mappings)
         
         return {
             'mapping_id': strategy_name,
-            'total_fit_score': round(total_fit_score, 2),
+            'total_fit_score': total_fit_score,
             'node_mappings': node_mappings,
             'link_mappings': link_mappings,
             'notes': f'Greedy best-fit mapping. All nodes matched to best available devices.',
         }
     
     def _generate_balanced_mapping(self, logical_nodes: List[Dict], logical_edges: List[Dict],
-                                   available_by_type: Dict[str, List[int]], physical_graph: nx.Graph,
+                                   available_by_type: Dict[str, Tuple[int, ...]], physical_graph: nx.Graph,
                                    strategy_name: str) -> Optional[Dict]:
         """Generate mapping trying to distribute devices evenly"""
         node_mappings = []
         device_usage_count = defaultdict(int)
         
         for logical_node in logical_nodes:
-            logical_type = logical_node.get('deviceType', '').lower()
-            available_devices = available_by_type.get(logical_type, [])
+            logical_type = logical_node.get('deviceType', '').strip().lower()
+            available_devices = available_by_type.get(logical_type, ())
             
             if not available_devices:
                 return None
             
-            # Get matches and prefer less-used devices
-            matches = self.match_logical_node(logical_node, available_devices, logical_edges)
+            # Get matches and prefer less-used devices (re-ranks every candidate)
+            matches = self._match_logical_node_typed(logical_node, available_devices, logical_edges, full=True)
             
             if not matches:
                 return None
@@ -422,7 +576,9 @@ class TopologyResolver:
                 scored_matches.append((adjusted_score, match))
             
             scored_matches.sort(key=lambda x: x[0], reverse=True)
-            best_match = scored_matches[0][1]
+            best_match = self._explain_candidate(scored_matches[0][1])
+            alternatives = [self._explain_candidate(dict(m[1])) for m in scored_matches[1:4]]
+            del matches, scored_matches
             
             device_usage_count[best_match['device_id']] += 1
             node_mappings.append({
@@ -432,53 +588,44 @@ class TopologyResolver:
                 'physical_device_type': best_match['device_type'],
                 'fit_score': best_match['fit_score'],
                 'confidence': 'high' if best_match['fit_score'] >= 0.8 else 'medium' if best_match['fit_score'] >= 0.5 else 'low',
-                'alternatives': [m[1] for m in scored_matches[1:4]],
+                'alternatives': alternatives,
                 'explanation': best_match.get('explanation', ''),
             })
         
         link_mappings = self._generate_link_mappings(logical_edges, node_mappings, physical_graph)
         
-        node_scores = [m['fit_score'] for m in node_mappings]
-        link_scores = [m['fit_score'] for m in link_mappings]
-        total_fit_score = (
-            (sum(node_scores) / len(node_scores) if node_scores else 0) * 0.7 +
-            (sum(link_scores) / len(link_scores) if link_scores else 0) * 0.3
-        )
+        total_fit_score = self._calculate_total_fit_score(node_mappings, link_mappings)
         
         return {
             'mapping_id': strategy_name,
-            'total_fit_score': round(total_fit_score, 2),
+            'total_fit_score': total_fit_score,
             'node_mappings': node_mappings,
             'link_mappings': link_mappings,
             'notes': 'Balanced distribution mapping. Tries to use different devices when possible.',
         }
     
     def _generate_connection_optimized_mapping(self, logical_nodes: List[Dict], logical_edges: List[Dict],
-                                               available_by_type: Dict[str, List[int]], physical_graph: nx.Graph,
+                                               available_by_type: Dict[str, Tuple[int, ...]], physical_graph: nx.Graph,
                                                strategy_name: str) -> Optional[Dict]:
         """Generate mapping preferring devices that are physically connected"""
         # Start with greedy, but boost score for connected devices
         node_mappings = []
         used_devices = set()
         
-        # Build logical adjacency
-        logical_adj = defaultdict(set)
-        for edge in logical_edges:
-            source = edge.get('source', '')
-            target = edge.get('target', '')
-            logical_adj[source].add(target)
-            logical_adj[target].add(source)
+        # Build logical adjacency (shared, read-only)
+        logical_adj = _build_logical_adj(_logical_edges_key(logical_edges))
         
         for logical_node in logical_nodes:
             logical_id = logical_node.get('id', '')
-            logical_type = logical_node.get('deviceType', '').lower()
-            available_devices = available_by_type.get(logical_type, [])
+            logical_type = logical_node.get('deviceType', '').strip().lower()
+            available_devices = available_by_type.get(logical_type, ())
             
-            candidates = [d for d in available_devices if d not in used_devices]
+            candidates = [d for d in available_devices if d not in used_devices] if used_devices else available_devices
             if not candidates:
                 candidates = available_devices
             
-            matches = self.match_logical_node(logical_node, candidates, logical_edges)
+            # The connection bonus below can promote any candidate, so rank all
+            matches = self._match_logical_node_typed(logical_node, candidates, logical_edges, full=True)
             
             if not matches:
                 return None
@@ -489,7 +636,7 @@ class TopologyResolver:
                 connection_bonus = 0.0
                 
                 # Check if this device is connected to any already-mapped devices
-                logical_neighbors = logical_adj.get(logical_id, set())
+                logical_neighbors = logical_adj.get(logical_id, frozenset())
                 for neighbor_id in logical_neighbors:
                     # Find physical device for neighbor
                     for nm in node_mappings:
@@ -502,8 +649,10 @@ class TopologyResolver:
                 match['fit_score'] = min(1.0, match['fit_score'] + connection_bonus)
             
             matches.sort(key=lambda x: x['fit_score'], reverse=True)
-            best_match = matches[0]
+            best_match = self._explain_candidate(matches[0])
             used_devices.add(best_match['device_id'])
+            alternatives = [self._explain_candidate(dict(m)) for m in matches[1:4]]
+            del matches
             
             node_mappings.append({
                 'logical_node_id': logical_id,
@@ -512,27 +661,32 @@ class TopologyResolver:
                 'physical_device_type': best_match['device_type'],
                 'fit_score': best_match['fit_score'],
                 'confidence': 'high' if best_match['fit_score'] >= 0.8 else 'medium' if best_match['fit_score'] >= 0.5 else 'low',
-                'alternatives': matches[1:4],
+                'alternatives': alternatives,
                 'explanation': best_match.get('explanation', ''),
             })
         
         link_mappings = self._generate_link_mappings(logical_edges, node_mappings, physical_graph)
         
-        node_scores = [m['fit_score'] for m in node_mappings]
-        link_scores = [m['fit_score'] for m in link_mappings]
-        total_fit_score = (
-            (sum(node_scores) / len(node_scores) if node_scores else 0) * 0.7 +
-            (sum(link_scores) / len(link_scores) if link_scores else 0) * 0.3
-        )
+        total_fit_score = self._calculate_total_fit_score(node_mappings, link_mappings)
         
         return {
             'mapping_id': strategy_name,
-            'total_fit_score': round(total_fit_score, 2),
+            'total_fit_score': total_fit_score,
             'node_mappings': node_mappings,
             'link_mappings': link_mappings,
             'notes': 'Connection-optimized mapping. Prefers physically connected devices.',
         }
     
+    def _calculate_total_fit_score(self, node_mappings: List[Dict], link_mappings: List[Dict]) -> float:
+        """Overall fit: 70% mean node fit score + 30% mean link fit score"""
+        node_total = sum(m['fit_score'] for m in node_mappings)
+        link_total = sum(m['fit_score'] for m in link_mappings)
+        total_fit_score = (
+            (node_total / len(node_mappings) if node_mappings else 0) * 0.7 +
+            (link_total / len(link_mappings) if link_mappings else 0) * 0.3
+        )
+        return round(total_fit_score, 2)
+    
     def _generate_link_mappings(self, logical_edges: List[Dict], node_mappings: List[Dict],
                                 physical_graph: nx.Graph) -> List[Dict]:
         """Generate mappings for logical edges to physical links"""
@@ -541,6 +695,10 @@ class TopologyResolver:
         # Create lookup: logical_node_id -> physical_device_id
         node_lookup = {nm['logical_node_id']: nm['physical_device_id'] for nm in node_mappings}
         
+        # One BFS per distinct physical source gives the hop count to every
+        # reachable device, shared by all edges leaving that device
+        path_lengths = {}
+        
         for edge in logical_edges:
             source_logical = edge.get('source', '')
             target_logical = edge.get('target', '')
@@ -550,23 +708,29 @@ class TopologyResolver:
             target_physical = node_lookup.get(target_logical)
             
             if source_physical and target_physical:
-                # Check if physical devices are connected
-                if physical_graph.has_edge(source_physical, target_physical):
+                if source_physical not in path_lengths:
+                    try:
+                        path_lengths[source_physical] = nx.single_source_shortest_path_length(
+                            physical_graph, source_physical
+                        )
+                    except nx.NodeNotFound:
+                        path_lengths[source_physical] = None
+                lengths = path_lengths[source_physical]
+                
+                if lengths is None or target_physical not in physical_graph:
+                    fit_score = 0.3
+                    explanation = "No physical path"
+                elif lengths.get(target_physical) is None:
+                    fit_score = 0.3
+                    explanation = "No physical path (may require additional configuration)"
+                elif lengths[target_physical] == 1:
+                    # Physical devices are directly connected
                     fit_score = 1.0
                     explanation = "Direct physical connection"
                 else:
-                    # Check if there's a path
-                    try:
-                        if nx.has_path(physical_graph, source_physical, target_physical):
-                            path_length = len(nx.shortest_path(physical_graph, source_physical, target_physical)) - 1
-                            fit_score = max(0.5, 1.0 - (path_length - 1) * 0.2)
-                            explanation = f"Indirect connection (path length: {path_length})"
-                        else:
-                            fit_score = 0.3
-                            explanation = "No physical path (may require additional configuration)"
-                    except (nx.NodeNotFound, nx.NetworkXNoPath):
-                        fit_score = 0.3
-                        explanation = "No physical path"
+                    path_length = lengths[target_physical]
+                    fit_score = max(0.5, 1.0 - (path_length - 1) * 0.2)
+                    explanation = f"Indirect connection (path length: {path_length})"
             else:
                 fit_score = 0.0
                 explanation = "Source or target device not mapped"
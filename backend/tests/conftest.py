@@ -1,6 +1,7 @@
 """
 Pytest configuration and fixtures for backend tests
 """
+import json
 import os
 import sys
 
@@ -10,12 +11,18 @@ import sys
 if not os.getenv("DATABASE_URL"):
     os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 
+# Cheapest bcrypt work factor; test passwords only need to round-trip
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 import pytest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import SimpleNamespace
 
 from backend.core.database import Base, SessionLocal
 from backend.main import app
@@ -25,11 +32,6 @@ from backend.scheduler.routers.admin_v2 import router as admin_v2_router
 from backend.scheduler.routers.control_panel import router as control_panel_router
 from backend.scheduler.models import User, Device, Booking
 from backend.core.hash import hash_password
-
-# Import inventory models to ensure their tables are created during tests
-# This is done via main.py import, but we explicitly import here to ensure
-# metadata is registered before Base.metadata.create_all() in db_session fixture
-from backend.inventory import models as inventory_models  # noqa: F401
 from backend.inventory.router import get_db as inventory_get_db
 
 
@@ -66,7 +68,8 @@ def _safety_check_production_database():
 _safety_check_production_database()
 
 
-# Use in-memory SQLite for testing
+# Use in-memory SQLite for testing. Each process gets its own private
+# database, so pytest-xdist workers (pytest -n auto) never share state
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 engine = create_engine(
@@ -75,26 +78,201 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
+
+
+# pysqlite begins transactions lazily on its own and breaks SAVEPOINT, so
+# SQLAlchemy takes over emitting BEGIN (needed for per-test rollback below)
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# Test data is throwaway: skip syncing and keep journal and temp data in memory
+_SQLITE_TEST_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_TEST_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test"""
+@lru_cache(maxsize=1)
+def _table_deletes():
+    """DELETE statements for every table, children first"""
+    return tuple(table.delete() for table in reversed(Base.metadata.sorted_tables))
+
+
+def _clear_tables(connection):
+    """Empty all tables without recreating the schema"""
+    with connection.begin():
+        for statement in _table_deletes():
+            connection.execute(statement)
+
+
+def pytest_configure(config):
+    """Create the schema once, before collection and fixture resolution"""
     # Double-check we're using test database
     assert TEST_DATABASE_URL.startswith("sqlite"), "Tests must use SQLite database"
     
+    # Registers the inventory tables on Base.metadata before create_all (main.py
+    # imports it too, but the schema must not depend on that)
+    import backend.inventory.models  # noqa: F401
     Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+
+
+def pytest_unconfigure(config):
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="session")
+def _connection():
+    """Share one connection, and one outer transaction, across all tests"""
+    connection = engine.connect()
+    connection.begin()
+    try:
+        yield connection
+    finally:
+        if connection.in_transaction():
+            connection.rollback()
+        connection.close()
+
+
+def _insert_shared_rows(connection, hashed_passwords, ids=None):
+    """Insert the session-wide test user and device, reusing `ids` if given"""
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    user = _make_user(hashed_passwords["user"])
+    device = _make_device()
+    if ids is not None:
+        user.id, device.id = ids.user_id, ids.device_id
+    db.add_all([user, device])
+    db.commit()
+    ids = SimpleNamespace(user_id=user.id, device_id=device.id)
+    db.close()
+    return ids
+
+
+@pytest.fixture(scope="session")
+def _shared_rows(_connection, _hashed_passwords):
+    """Ids of the test user and device, inserted once in the outer transaction"""
+    return _insert_shared_rows(_connection, _hashed_passwords)
+
+
+@pytest.fixture(scope="module")
+def module_db(_connection, _shared_rows):
+    """Session for rows shared by one module, inside a SAVEPOINT rolled back after it"""
+    # Depends on _shared_rows so those are never created inside this SAVEPOINT
+    transaction = _connection.begin_nested()
+    db = TestingSessionLocal(bind=_connection, join_transaction_mode="create_savepoint")
+    # Tells db_session's fallback that module-scoped rows are live
+    _connection.info["module_db_depth"] = _connection.info.get("module_db_depth", 0) + 1
     try:
         yield db
     finally:
+        _connection.info["module_db_depth"] -= 1
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        if transaction.is_active:
+            transaction.rollback()
+
+
+@pytest.fixture(scope="module")
+def device_zoo(module_db):
+    """Ids of devices for read-only tests, inserted once per module"""
+    devices = [
+        Device(
+            deviceType="Router",
+            deviceName=f"ZooRouter{i}",
+            ip_address=f"192.168.2.{i}",
+            status="Available",
+            Out_Port=2 * i + 1,
+            In_Port=2 * i + 2
+        )
+        for i in range(5)
+    ]
+    module_db.add_all(devices)
+    module_db.commit()
+    return [device.id for device in devices]
+
+
+@pytest.fixture(scope="function")
+def db_session(_connection, _shared_rows, _hashed_passwords):
+    """Session inside a SAVEPOINT that is rolled back after each test"""
+    transaction = _connection.begin_nested()
+    # commit()/rollback() in tests and routes only release or roll back an
+    # inner SAVEPOINT, so nothing outlives the test
+    db = TestingSessionLocal(bind=_connection, join_transaction_mode="create_savepoint")
+    try:
+        yield db
+    finally:
+        db.close()
+        if transaction.is_active:
+            transaction.rollback()
+        else:
+            # The code under test ended the transaction, so its writes may have
+            # been committed; delete them rather than rebuild the schema, then
+            # restore the shared rows
+            if _connection.in_transaction():
+                _connection.rollback()
+            _clear_tables(_connection)
+            _connection.begin()
+            _insert_shared_rows(_connection, _hashed_passwords, _shared_rows)
+            if _connection.info.get("module_db_depth"):
+                # Rows from module_db (device_zoo, shared prerequisites) were
+                # deleted too and cannot be restored; later tests in the
+                # module would see dangling ids
+                pytest.fail(
+                    "The test ended the outer transaction, deleting this module's "
+                    "module_db rows; use db_session commits instead of ending the "
+                    "connection's transaction"
+                )
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _mock_notifications():
+    """Never send real Discord notifications for bookings created in tests"""
+    with patch("backend.main.send_booking_created_notification") as created:
+        yield created
+
+
+@pytest.fixture
+def bulk_create(db_session):
+    """Add several objects and flush them together, returning them with ids"""
+    def _bulk_create(objs):
+        # SQLAlchemy 2.0 batches the flush into one INSERT per table, and the
+        # objects stay attached so routes' changes to them are visible
+        db_session.add_all(objs)
+        db_session.flush()
+        return objs
+    return _bulk_create
+
+
+@pytest.fixture(scope="session")
+def _raw_client():
+    """One TestClient for the whole session; per-test state is reset by client"""
+    # Entering it runs startup once and keeps one event loop portal open for
+    # every request, instead of starting a new one per call
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(_raw_client, db_session):
     """Create a test client with database override"""
     def override_get_db():
         try:
@@ -104,54 +282,63 @@ def client(db_session):
 
     # Override get_db dependency (all routers use the same get_db from backend.core.deps)
     app.dependency_overrides[get_db] = override_get_db
+    _raw_client.cookies.clear()
     
-    test_client = TestClient(app)
-    
-    # Verify the override is working
-    assert get_db in app.dependency_overrides, "Database dependency override failed"
-    
-    yield test_client
+    yield _raw_client
     app.dependency_overrides.clear()
+    _raw_client.cookies.clear()
 
 
-@pytest.fixture
-def test_user(db_session):
-    """Create a test user"""
-    hashed_password = hash_password("testpassword123")
-    user = User(
+@pytest.fixture(scope="session")
+def _now():
+    """Baseline timestamp shared by every fixture in the session"""
+    return datetime.now()
+
+
+@pytest.fixture(autouse=True)
+def frozen_now(monkeypatch, _now):
+    """Freeze the server-side clock at the session baseline"""
+    monkeypatch.setattr("backend.main.current_time", lambda: _now)
+    return _now
+
+
+@pytest.fixture(scope="session")
+def _hashed_passwords():
+    """Hash the fixture passwords once; bcrypt is deliberately slow"""
+    return {
+        "user": hash_password("testpassword123"),
+        "admin": hash_password("adminpassword123"),
+    }
+
+
+@pytest.fixture(scope="session")
+def hashed_test_password():
+    """bcrypt hash of "pass123" for users created inside tests"""
+    return hash_password("pass123")
+
+
+def _make_user(hashed_password):
+    return User(
         username="testuser",
         email="test@example.com",
         password=hashed_password,
         is_admin=False,
         discord_id="123456789"
     )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
 
 
-@pytest.fixture
-def test_admin(db_session):
-    """Create a test admin user"""
-    hashed_password = hash_password("adminpassword123")
-    admin = User(
+def _make_admin(hashed_password):
+    return User(
         username="testadmin",
         email="admin@example.com",
         password=hashed_password,
         is_admin=True,
         discord_id="987654321"
     )
-    db_session.add(admin)
-    db_session.commit()
-    db_session.refresh(admin)
-    return admin
 
 
-@pytest.fixture
-def test_device(db_session):
-    """Create a test device"""
-    device = Device(
+def _make_device():
+    return Device(
         deviceType="Router",
         deviceName="Router1",
         ip_address="192.168.1.1",
@@ -159,52 +346,98 @@ def test_device(db_session):
         Out_Port=1,
         In_Port=2
     )
-    db_session.add(device)
-    db_session.commit()
-    db_session.refresh(device)
-    return device
 
 
-@pytest.fixture
-def test_booking(db_session, test_user, test_device):
-    """Create a test booking"""
-    start_time = datetime.now() + timedelta(days=1)
+def _make_booking(user, device, now):
+    start_time = now + timedelta(days=1)
     end_time = start_time + timedelta(hours=5)
-    
-    booking = Booking(
-        device_id=test_device.id,
-        user_id=test_user.id,
+    return Booking(
+        device_id=device.id,
+        user_id=user.id,
         start_time=start_time,
         end_time=end_time,
         status="PENDING",
         comment="Test booking"
     )
+
+
+@pytest.fixture
+def seeded(db_session, test_user, test_device, _hashed_passwords, _now):
+    """The test user and device plus an admin and booking added with a single commit"""
+    admin = _make_admin(_hashed_passwords["admin"])
+    booking = _make_booking(test_user, test_device, _now)
+    db_session.add_all([admin, booking])
+    db_session.commit()
+    return SimpleNamespace(user=test_user, admin=admin, device=test_device, booking=booking)
+
+
+@pytest.fixture
+def test_user(db_session, _shared_rows):
+    """The test user (inserted once per session; changes roll back per test)"""
+    return db_session.get(User, _shared_rows.user_id)
+
+
+@pytest.fixture
+def test_admin(db_session, _hashed_passwords):
+    """Create a test admin user"""
+    admin = _make_admin(_hashed_passwords["admin"])
+    db_session.add(admin)
+    db_session.commit()
+    return admin
+
+
+@pytest.fixture
+def test_device(db_session, _shared_rows):
+    """The test device (inserted once per session; changes roll back per test)"""
+    return db_session.get(Device, _shared_rows.device_id)
+
+
+@pytest.fixture
+def test_booking(db_session, test_user, test_device, _now):
+    """Create a test booking"""
+    booking = _make_booking(test_user, test_device, _now)
     db_session.add(booking)
     db_session.commit()
-    db_session.refresh(booking)
     return booking
 
 
-@pytest.fixture
-def authenticated_client(client, test_user):
-    """Create an authenticated test client"""
-    # Login to get session
-    response = client.post(
-        "/login",
-        json={"username": test_user.username, "password": "testpassword123"}
-    )
+@pytest.fixture(scope="session")
+def _session_cookies():
+    """Login cookies by (login path, user id), reused across tests"""
+    return {}
+
+
+# Login request bodies for the fixture users, serialised once
+_LOGIN_HEADERS = {"content-type": "application/json"}
+_USER_LOGIN_BYTES = json.dumps({"username": "testuser", "password": "testpassword123"}).encode()
+_ADMIN_LOGIN_BYTES = json.dumps({"username": "testadmin", "password": "adminpassword123"}).encode()
+
+
+def _login(client, session_cookies, path, user, login_body):
+    # The session cookie only carries the user id, and the per-test rollback
+    # recreates the fixture users with the same ids, so one login per user
+    # serves the whole session
+    key = (path, user.id)
+    if key in session_cookies:
+        # Restore the original cookie objects so their domain matches what
+        # the server sets (and clears on logout)
+        for cookie in session_cookies[key]:
+            client.cookies.jar.set_cookie(cookie)
+        return client
+    
+    response = client.post(path, content=login_body, headers=_LOGIN_HEADERS)
     assert response.status_code == 200
+    session_cookies[key] = list(client.cookies.jar)
     return client
 
 
 @pytest.fixture
-def authenticated_admin_client(client, test_admin):
-    """Create an authenticated admin test client"""
-    # Login as admin
-    response = client.post(
-        "/admin/login",
-        json={"username": test_admin.username, "password": "adminpassword123"}
-    )
-    assert response.status_code == 200
-    return client
+def authenticated_client(client, test_user, _session_cookies):
+    """Create an authenticated test client"""
+    return _login(client, _session_cookies, "/login", test_user, _USER_LOGIN_BYTES)
 
+
+@pytest.fixture
+def authenticated_admin_client(client, test_admin, _session_cookies):
+    """Create an authenticated admin test client"""
+    return _login(client, _session_cookies, "/admin/login", test_admin, _ADMIN_LOGIN_BYTES)
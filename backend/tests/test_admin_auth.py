@@ -5,16 +5,11 @@ import pytest
 import os
 from unittest.mock import patch
 from models import User
-import importlib
 
 
 def test_admin_registration_success(client, db_session, monkeypatch):
     """Test successful admin registration with correct secret"""
     monkeypatch.setenv("ADMIN_SECRET", "test_secret_key")
-    # Reload admin module to pick up new env var
-    import importlib
-    import admin
-    importlib.reload(admin)
     
     response = client.post(
         "/admin/register",
@@ -36,9 +31,6 @@ def test_admin_registration_success(client, db_session, monkeypatch):
 def test_admin_registration_invalid_secret(client, monkeypatch):
     """Test admin registration with invalid secret"""
     monkeypatch.setenv("ADMIN_SECRET", "correct_secret")
-    import importlib
-    import admin
-    importlib.reload(admin)
     
     response = client.post(
         "/admin/register",
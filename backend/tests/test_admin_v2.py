@@ -16,7 +16,7 @@ from models import (
 )
 
 
-def _make_booking(db, user, device, *, status="PENDING", delta_hours=1):
+def _make_booking(db, user, device, *, status="PENDING", delta_hours=1, commit=True):
     start = datetime.now(UTC) + timedelta(hours=delta_hours)
     end = start + timedelta(hours=2)
     booking = Booking(
@@ -28,8 +28,9 @@ def _make_booking(db, user, device, *, status="PENDING", delta_hours=1):
         comment=f"{status.title()} booking",
     )
     db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    # Callers adding several rows pass commit=False and commit once at the end
+    if commit:
+        db.commit()
     return booking
 
 
@@ -48,8 +49,8 @@ def test_admin_v2_dashboard_with_sample_data(
     authenticated_admin_client, db_session, test_admin, test_device, test_user
 ):
     # Populate the database with a couple of bookings and an audit log entry.
-    _make_booking(db_session, test_user, test_device, status="PENDING", delta_hours=4)
-    _make_booking(db_session, test_user, test_device, status="CONFIRMED", delta_hours=8)
+    _make_booking(db_session, test_user, test_device, status="PENDING", delta_hours=4, commit=False)
+    _make_booking(db_session, test_user, test_device, status="CONFIRMED", delta_hours=8, commit=False)
 
     log = AdminAuditLog(
         actor_id=test_admin.id,
@@ -95,7 +96,7 @@ def test_admin_v2_dashboard_with_sample_data(
 def test_admin_v2_bookings_listing_and_bulk_actions(
     authenticated_admin_client, db_session, test_admin, test_user, test_device
 ):
-    pending = _make_booking(db_session, test_user, test_device, status="PENDING")
+    pending = _make_booking(db_session, test_user, test_device, status="PENDING", commit=False)
     conflicting = _make_booking(db_session, test_user, test_device, status="CONFLICTING", delta_hours=2)
 
     start_date = pending.start_time.date().isoformat()
@@ -4,7 +4,15 @@ Tests for booking approval/rejection endpoints
 import pytest
 from datetime import datetime, timedelta
 from models import Booking
-from unittest.mock import patch
+
+
+@pytest.fixture(autouse=True)
+def _no_notify(monkeypatch):
+    """Skip Discord notifications for admin actions"""
+    monkeypatch.setattr(
+        "backend.scheduler.routers.admin.send_admin_action_notification",
+        lambda *args, **kwargs: None,
+    )
 
 
 def test_get_pending_bookings(authenticated_admin_client, test_user, test_device, db_session):
@@ -19,7 +27,7 @@ def test_get_pending_bookings(authenticated_admin_client, test_user, test_device
         status="PENDING"
     )
     db_session.add(booking)
-    db_session.commit()
+    db_session.flush()
     
     response = authenticated_admin_client.get("/admin/bookings/pending")
     assert response.status_code == 200
@@ -43,11 +51,10 @@ def test_approve_booking(authenticated_admin_client, test_booking):
     """Test approving a pending booking"""
     test_booking.status = "PENDING"
     
-    with patch('admin.send_admin_action_notification'):
-        response = authenticated_admin_client.put(
-            f"/admin/bookings/{test_booking.booking_id}",
-            json={"status": "CONFIRMED"}
-        )
+    response = authenticated_admin_client.put(
+        f"/admin/bookings/{test_booking.booking_id}",
+        json={"status": "CONFIRMED"}
+    )
     
     assert response.status_code == 200
     assert "updated" in response.json()["message"].lower()
@@ -57,11 +64,10 @@ def test_reject_booking(authenticated_admin_client, test_booking):
     """Test rejecting a pending booking"""
     test_booking.status = "PENDING"
     
-    with patch('admin.send_admin_action_notification'):
-        response = authenticated_admin_client.put(
-            f"/admin/bookings/{test_booking.booking_id}",
-            json={"status": "REJECTED"}
-        )
+    response = authenticated_admin_client.put(
+        f"/admin/bookings/{test_booking.booking_id}",
+        json={"status": "REJECTED"}
+    )
     
     assert response.status_code == 200
     assert "updated" in response.json()["message"].lower()
@@ -115,7 +121,7 @@ def test_get_conflicting_bookings(authenticated_admin_client, test_user, test_de
         status="CONFLICTING"
     )
     db_session.add_all([booking1, booking2])
-    db_session.commit()
+    db_session.flush()
     
     response = authenticated_admin_client.get("/admin/bookings/pending")
     assert response.status_code == 200
@@ -136,13 +142,12 @@ def test_approve_conflicting_booking(authenticated_admin_client, test_user, test
         status="CONFLICTING"
     )
     db_session.add(conflicting_booking)
-    db_session.commit()
+    db_session.flush()
     
-    with patch('admin.send_admin_action_notification'):
-        response = authenticated_admin_client.put(
-            f"/admin/bookings/{conflicting_booking.booking_id}",
-            json={"status": "CONFIRMED"}
-        )
+    response = authenticated_admin_client.put(
+        f"/admin/bookings/{conflicting_booking.booking_id}",
+        json={"status": "CONFIRMED"}
+    )
     
     assert response.status_code == 200
     db_session.refresh(conflicting_booking)
@@ -4,31 +4,34 @@ Tests for booking endpoints
 import pytest
 from datetime import datetime, timedelta
 from models import Booking, Device
-from unittest.mock import patch, MagicMock
+
+# Shared booking window for tests that only need "some time tomorrow"
+FUTURE_START = datetime.now() + timedelta(days=1)
+FUTURE_END = FUTURE_START + timedelta(hours=5)
+FUTURE_START_ISO = FUTURE_START.isoformat()
+FUTURE_END_ISO = FUTURE_END.isoformat()
+
+# One booking entry for the shared test device (Router1); tests override
+# only the fields they vary
+BOOKING_PAYLOAD_TEMPLATE = {
+    "device_type": "Router",
+    "device_name": "Router1",
+    "start_time": FUTURE_START_ISO,
+    "end_time": FUTURE_END_ISO,
+    "status": "PENDING",
+}
 
 
 def test_create_single_booking(authenticated_client, test_user, test_device):
     """Test creating a single booking"""
-    start_time = datetime.now() + timedelta(days=1)
-    end_time = start_time + timedelta(hours=5)
-    
-    with patch('main.send_booking_created_notification'):
-        response = authenticated_client.post(
-            "/bookings",
-            json={
-                "user_id": test_user.id,
-                "message": "Test booking",
-                "bookings": [
-                    {
-                        "device_type": test_device.deviceType,
-                        "device_name": test_device.deviceName,
-                        "start_time": start_time.isoformat(),
-                        "end_time": end_time.isoformat(),
-                        "status": "PENDING"
-                    }
-                ]
-            }
-        )
+    response = authenticated_client.post(
+        "/bookings",
+        json={
+            "user_id": test_user.id,
+            "message": "Test booking",
+            "bookings": [BOOKING_PAYLOAD_TEMPLATE]
+        }
+    )
     
     assert response.status_code == 200
     data = response.json()
@@ -36,7 +39,7 @@ def test_create_single_booking(authenticated_client, test_user, test_device):
     assert "successfully" in data["message"].lower()
 
 
-def test_create_multi_device_booking(authenticated_client, test_user, db_session):
+def test_create_multi_device_booking(authenticated_client, test_user, bulk_create):
     """Test creating a booking for multiple devices"""
     # Create multiple devices
     device1 = Device(
@@ -53,36 +56,21 @@ def test_create_multi_device_booking(authenticated_client, test_user, db_session
         Out_Port=3,
         In_Port=4
     )
-    db_session.add_all([device1, device2])
-    db_session.commit()
+    bulk_create([device1, device2])
     
-    start_time = datetime.now() + timedelta(days=1)
-    end_time = start_time + timedelta(hours=3)
+    end_time = (FUTURE_START + timedelta(hours=3)).isoformat()
     
-    with patch('main.send_booking_created_notification'):
-        response = authenticated_client.post(
-            "/bookings",
-            json={
-                "user_id": test_user.id,
-                "message": "Multi-device booking",
-                "bookings": [
-                    {
-                        "device_type": "Router",
-                        "device_name": "Router1",
-                        "start_time": start_time.isoformat(),
-                        "end_time": end_time.isoformat(),
-                        "status": "PENDING"
-                    },
-                    {
-                        "device_type": "Switch",
-                        "device_name": "Switch1",
-                        "start_time": start_time.isoformat(),
-                        "end_time": end_time.isoformat(),
-                        "status": "PENDING"
-                    }
-                ]
-            }
-        )
+    response = authenticated_client.post(
+        "/bookings",
+        json={
+            "user_id": test_user.id,
+            "message": "Multi-device booking",
+            "bookings": [
+                BOOKING_PAYLOAD_TEMPLATE | {"end_time": end_time},
+                BOOKING_PAYLOAD_TEMPLATE | {"device_type": "Switch", "device_name": "Switch1", "end_time": end_time},
+            ]
+        }
+    )
     
     assert response.status_code == 200
     data = response.json()
@@ -91,23 +79,12 @@ def test_create_multi_device_booking(authenticated_client, test_user, db_session
 
 def test_create_booking_nonexistent_user(authenticated_client, test_device):
     """Test creating booking with non-existent user"""
-    start_time = datetime.now() + timedelta(days=1)
-    end_time = start_time + timedelta(hours=5)
-    
     response = authenticated_client.post(
         "/bookings",
         json={
             "user_id": 99999,
             "message": "Test",
-            "bookings": [
-                {
-                    "device_type": test_device.deviceType,
-                    "device_name": test_device.deviceName,
-                    "start_time": start_time.isoformat(),
-                    "end_time": end_time.isoformat(),
-                    "status": "PENDING"
-                }
-            ]
+            "bookings": [BOOKING_PAYLOAD_TEMPLATE]
         }
     )
     assert response.status_code == 400
@@ -123,16 +100,10 @@ def test_cancel_booking(authenticated_client, test_booking):
     assert "cancelled" in response.json()["message"].lower()
 
 
-def test_cancel_nonexistent_booking(authenticated_client):
-    """Test canceling a non-existent booking"""
-    response = authenticated_client.put("/bookings/99999/cancel")
-    assert response.status_code == 404
-
-
 def test_cancel_already_cancelled_booking(authenticated_client, test_booking, db_session):
     """Test canceling an already cancelled booking"""
     test_booking.status = "CANCELLED"
-    db_session.commit()
+    db_session.flush()
     
     response = authenticated_client.put(
         f"/bookings/{test_booking.booking_id}/cancel"
@@ -144,7 +115,7 @@ def test_cancel_already_cancelled_booking(authenticated_client, test_booking, db
 def test_delete_booking(authenticated_client, test_booking, db_session):
     """Test deleting a booking"""
     test_booking.status = "CANCELLED"
-    db_session.commit()
+    db_session.flush()
     
     response = authenticated_client.delete(
         f"/bookings/{test_booking.booking_id}"
@@ -153,12 +124,6 @@ def test_delete_booking(authenticated_client, test_booking, db_session):
     assert "deleted" in response.json()["message"].lower()
 
 
-def test_delete_nonexistent_booking(authenticated_client):
-    """Test deleting a non-existent booking"""
-    response = authenticated_client.delete("/bookings/99999")
-    assert response.status_code == 404
-
-
 def test_get_user_bookings(authenticated_client, test_user, test_booking):
     """Test getting all bookings for a user"""
     response = authenticated_client.get(f"/bookings/user/{test_user.id}")
@@ -169,9 +134,14 @@ def test_get_user_bookings(authenticated_client, test_user, test_booking):
     assert data[0]["booking_id"] == test_booking.booking_id
 
 
-def test_get_user_bookings_nonexistent_user(authenticated_client):
-    """Test getting bookings for non-existent user"""
-    response = authenticated_client.get("/bookings/user/99999")
+@pytest.mark.parametrize("method,path", [
+    ("PUT", "/bookings/99999/cancel"),
+    ("DELETE", "/bookings/99999"),
+    ("GET", "/bookings/user/99999"),
+], ids=["cancel_booking", "delete_booking", "user_bookings"])
+def test_endpoints_return_404(authenticated_client, method, path):
+    """Test booking endpoints with a non-existent booking or user"""
+    response = authenticated_client.request(method, path)
     assert response.status_code == 404
 
 
@@ -192,38 +162,35 @@ def test_get_bookings_for_week_invalid_date(authenticated_client):
     assert response.status_code == 400
 
 
-def test_booking_auto_expire(authenticated_client, test_user, test_booking, db_session):
+def test_booking_auto_expire(authenticated_client, test_user, test_booking, db_session, frozen_now):
     """Test that expired bookings are automatically marked as expired"""
-    # Set booking to past
-    test_booking.start_time = datetime.now() - timedelta(days=2)
-    test_booking.end_time = datetime.now() - timedelta(days=1)
+    # Set booking to past (relative to the frozen server clock)
+    test_booking.start_time = frozen_now - timedelta(days=2)
+    test_booking.end_time = frozen_now - timedelta(days=1)
     test_booking.status = "CONFIRMED"
-    db_session.commit()
+    db_session.flush()
     
     response = authenticated_client.get(f"/bookings/user/{test_user.id}")
     assert response.status_code == 200
     data = response.json()
     # Find the expired booking
     expired = [b for b in data if b["booking_id"] == test_booking.booking_id]
-    if expired:
-        assert expired[0]["status"] == "EXPIRED"
+    assert expired[0]["status"] == "EXPIRED"
 
 
 def test_cancel_booking_resolves_conflict(authenticated_client, test_user, test_device, db_session):
     """Test that canceling a booking resolves conflicts"""
     # Create two overlapping bookings
-    start_time = datetime.now() + timedelta(days=1)
-    end_time = start_time + timedelta(hours=5)
     
     booking1 = Booking(
         device_id=test_device.id,
         user_id=test_user.id,
-        start_time=start_time,
-        end_time=end_time,
+        start_time=FUTURE_START,
+        end_time=FUTURE_END,
         status="CONFLICTING"
     )
     db_session.add(booking1)
-    db_session.commit()
+    db_session.flush()
     
     # Cancel the conflicting booking
     response = authenticated_client.put(f"/bookings/{booking1.booking_id}/cancel")
@@ -0,0 +1,35 @@
+"""
+Self-tests for the shared fixtures in conftest.py
+"""
+import pytest
+
+
+def test_conftest_override_is_installed(client, db_session):
+    """The client fixture routes get_db to the test session"""
+    from backend.core.deps import get_db
+    from backend.main import app
+
+    assert get_db in app.dependency_overrides, "Database dependency override failed"
+    assert next(app.dependency_overrides[get_db]()) is db_session
+
+
+def test_seeded_fixture_links_objects(seeded, db_session):
+    """The combined fixture persists every object in one transaction"""
+    assert seeded.booking.user_id == seeded.user.id
+    assert seeded.booking.device_id == seeded.device.id
+    assert seeded.admin.is_admin is True
+    assert db_session.get(type(seeded.booking), seeded.booking.booking_id) is seeded.booking
+
+
+@pytest.mark.parametrize("attempt", range(2))
+def test_authenticated_client_reuses_login(authenticated_client, test_user, attempt):
+    """Cached login cookies still authenticate the current test's user"""
+    data = authenticated_client.get("/session").json()
+    assert data["logged_in"] is True
+    assert data["user_id"] == test_user.id
+
+
+def test_device_zoo_is_visible_to_db_session(device_zoo, db_session):
+    """Module-scoped zoo devices are readable from the per-test session"""
+    from backend.scheduler.models import Device
+    assert all(db_session.get(Device, device_id) is not None for device_id in device_zoo)
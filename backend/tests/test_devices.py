@@ -2,10 +2,11 @@
 Tests for device management endpoints (admin only)
 """
 import pytest
+from datetime import datetime, timedelta
 from models import Device
 
 
-def test_get_all_devices(authenticated_admin_client, test_device):
+def test_get_all_devices(authenticated_admin_client, device_zoo):
     """Test getting all devices (admin only)"""
     response = authenticated_admin_client.get("/admin/devices")
     assert response.status_code == 200
@@ -20,48 +21,59 @@ def test_get_devices_requires_admin(authenticated_client):
     assert response.status_code == 403
 
 
-def test_add_device(authenticated_admin_client):
-    """Test adding a new device"""
-    response = authenticated_admin_client.post(
-        "/admin/devices",
-        json={
+# Marks fields that only need to be present in the response
+_PRESENT = object()
+_TOMORROW = (datetime.now() + timedelta(days=1)).date().strftime('%Y-%m-%d')
+
+
+@pytest.mark.parametrize("payload,expected", [
+    (
+        {
             "deviceType": "Router",
             "deviceName": "NewRouter",
             "ip_address": "192.168.1.100",
             "status": "Available",
             "Out_Port": 10,
             "In_Port": 20
-        }
-    )
-    assert response.status_code == 201
-    data = response.json()
-    assert data["deviceType"] == "Router"
-    assert data["deviceName"] == "NewRouter"
-    assert data["ip_address"] == "192.168.1.100"
-
-
-def test_add_device_with_maintenance(authenticated_admin_client):
-    """Test adding device with maintenance period"""
-    from datetime import datetime, timedelta
-    tomorrow = datetime.now() + timedelta(days=1)
-    
-    response = authenticated_admin_client.post(
-        "/admin/devices",
-        json={
+        },
+        {"deviceType": "Router", "deviceName": "NewRouter", "ip_address": "192.168.1.100"},
+    ),
+    (
+        {
             "deviceType": "Switch",
             "deviceName": "Switch1",
             "ip_address": "192.168.1.101",
             "status": "Maintenance",
-            "maintenance_start": f"All Day/{tomorrow.date().strftime('%Y-%m-%d')}",
-            "maintenance_end": f"All Day/{tomorrow.date().strftime('%Y-%m-%d')}",
+            "maintenance_start": f"All Day/{_TOMORROW}",
+            "maintenance_end": f"All Day/{_TOMORROW}",
             "Out_Port": 11,
             "In_Port": 21
-        }
-    )
+        },
+        {"status": "Maintenance", "maintenance_start": _PRESENT},
+    ),
+    (
+        {
+            "polatis_name": "POLATIS_001",
+            "deviceType": "Router",
+            "deviceName": "RouterWithPolatis",
+            "ip_address": "192.168.1.102",
+            "status": "Available",
+            "Out_Port": 13,
+            "In_Port": 23
+        },
+        {"polatis_name": "POLATIS_001"},
+    ),
+], ids=["basic", "maintenance", "polatis_name"])
+def test_add_device(authenticated_admin_client, payload, expected):
+    """Test adding a new device (plain, with maintenance period, with Polatis name)"""
+    response = authenticated_admin_client.post("/admin/devices", json=payload)
     assert response.status_code == 201
     data = response.json()
-    assert data["status"] == "Maintenance"
-    assert data["maintenance_start"] is not None
+    for field, value in expected.items():
+        if value is _PRESENT:
+            assert data[field] is not None
+        else:
+            assert data[field] == value
 
 
 def test_add_device_duplicate_ip(authenticated_admin_client, test_device):
@@ -100,21 +112,6 @@ def test_update_device(authenticated_admin_client, test_device):
     assert data["status"] == "Maintenance"
 
 
-def test_update_device_nonexistent(authenticated_admin_client):
-    """Test updating non-existent device"""
-    response = authenticated_admin_client.put(
-        "/admin/devices/99999",
-        json={
-            "deviceType": "Router",
-            "deviceName": "Router1",
-            "status": "Available",
-            "Out_Port": 1,
-            "In_Port": 2
-        }
-    )
-    assert response.status_code == 404
-
-
 def test_delete_device(authenticated_admin_client, test_device):
     """Test deleting a device"""
     response = authenticated_admin_client.delete(f"/admin/devices/{test_device.id}")
@@ -122,37 +119,31 @@ def test_delete_device(authenticated_admin_client, test_device):
     assert "deleted" in response.json()["message"].lower()
 
 
-def test_delete_device_nonexistent(authenticated_admin_client):
-    """Test deleting non-existent device"""
-    response = authenticated_admin_client.delete("/admin/devices/99999")
+@pytest.mark.parametrize("method,body", [
+    (
+        "PUT",
+        {
+            "deviceType": "Router",
+            "deviceName": "Router1",
+            "status": "Available",
+            "Out_Port": 1,
+            "In_Port": 2
+        },
+    ),
+    ("DELETE", None),
+], ids=["update", "delete"])
+def test_device_endpoints_nonexistent(authenticated_admin_client, method, body):
+    """Test updating and deleting a non-existent device"""
+    response = authenticated_admin_client.request(method, "/admin/devices/99999", json=body)
     assert response.status_code == 404
 
 
-def test_delete_device_requires_admin(authenticated_client, test_device):
+def test_delete_device_requires_admin(authenticated_client, device_zoo):
     """Test that non-admin users cannot delete devices"""
-    response = authenticated_client.delete(f"/admin/devices/{test_device.id}")
+    response = authenticated_client.delete(f"/admin/devices/{device_zoo[0]}")
     assert response.status_code == 403
 
 
-def test_add_device_with_polatis_name(authenticated_admin_client):
-    """Test adding device with Polatis name"""
-    response = authenticated_admin_client.post(
-        "/admin/devices",
-        json={
-            "polatis_name": "POLATIS_001",
-            "deviceType": "Router",
-            "deviceName": "RouterWithPolatis",
-            "ip_address": "192.168.1.102",
-            "status": "Available",
-            "Out_Port": 13,
-            "In_Port": 23
-        }
-    )
-    assert response.status_code == 201
-    data = response.json()
-    assert data["polatis_name"] == "POLATIS_001"
-
-
 def test_add_device_duplicate_polatis_name(authenticated_admin_client, db_session):
     """Test adding device with duplicate Polatis name in same device group"""
     # Create first device
@@ -165,7 +156,7 @@ def test_add_device_duplicate_polatis_name(authenticated_admin_client, db_sessio
         In_Port=2
     )
     db_session.add(device1)
-    db_session.commit()
+    db_session.flush()
     
     # Try to add another with same Polatis name in same group
     response = authenticated_admin_client.post(
@@ -5,7 +5,16 @@ import pytest
 from datetime import datetime, timedelta
 from models import User, Device, Booking
 from hash import hash_password
-from unittest.mock import patch
+
+# Keep the workflows on one xdist worker (with --dist loadgroup) so they share
+# the module's notification mock instead of racing on it
+pytestmark = pytest.mark.xdist_group("integration")
+
+# Shared booking window for tests that only need "some time tomorrow"
+FUTURE_START = datetime.now() + timedelta(days=1)
+FUTURE_END = FUTURE_START + timedelta(hours=5)
+FUTURE_START_ISO = FUTURE_START.isoformat()
+FUTURE_END_ISO = FUTURE_END.isoformat()
 
 
 @pytest.mark.integration
@@ -20,27 +29,23 @@ def test_complete_booking_workflow(authenticated_client, test_user, db_session):
         In_Port=2
     )
     db_session.add(device)
-    db_session.commit()
+    db_session.flush()
     
     # Create booking
-    start_time = datetime.now() + timedelta(days=1)
-    end_time = start_time + timedelta(hours=5)
-    
-    with patch('main.send_booking_created_notification'):
-        response = authenticated_client.post(
-            "/bookings",
-            json={
-                "user_id": test_user.id,
-                "message": "Integration test booking",
-                "bookings": [{
-                    "device_type": "Router",
-                    "device_name": "Router1",
-                    "start_time": start_time.isoformat(),
-                    "end_time": end_time.isoformat(),
-                    "status": "PENDING"
-                }]
-            }
-        )
+    response = authenticated_client.post(
+        "/bookings",
+        json={
+            "user_id": test_user.id,
+            "message": "Integration test booking",
+            "bookings": [{
+                "device_type": "Router",
+                "device_name": "Router1",
+                "start_time": FUTURE_START_ISO,
+                "end_time": FUTURE_END_ISO,
+                "status": "PENDING"
+            }]
+        }
+    )
     assert response.status_code == 200
     
     # Get bookings
@@ -58,10 +63,10 @@ def test_complete_booking_workflow(authenticated_client, test_user, db_session):
     )
     assert cancel_response.status_code == 200
     
-    # Verify cancellation
-    bookings_response = authenticated_client.get(f"/bookings/user/{test_user.id}")
-    cancelled = [b for b in bookings_response.json() if b["booking_id"] == booking_id]
-    assert cancelled[0]["status"] == "CANCELLED"
+    # Verify cancellation straight from the session the route used
+    db_session.expire_all()
+    cancelled = db_session.query(Booking).filter_by(booking_id=booking_id).one()
+    assert cancelled.status == "CANCELLED"
 
 
 @pytest.mark.integration
@@ -155,29 +160,27 @@ def test_booking_conflict_detection_workflow(authenticated_client, test_user, db
         In_Port=2
     )
     db_session.add(device)
-    db_session.commit()
+    db_session.flush()
     
     # Create first booking
-    start_time = datetime.now() + timedelta(days=1)
-    end_time = start_time + timedelta(hours=5)
     
     booking1 = Booking(
         device_id=device.id,
         user_id=test_user.id,
-        start_time=start_time,
-        end_time=end_time,
+        start_time=FUTURE_START,
+        end_time=FUTURE_END,
         status="CONFIRMED"
     )
     db_session.add(booking1)
-    db_session.commit()
+    db_session.flush()
     
     # Check for conflicts
     conflict_response = authenticated_client.post(
         "/check-conflicts",
         json={
             "device_ids": [device.id],
-            "start": (start_time + timedelta(hours=1)).isoformat(),
-            "end": (start_time + timedelta(hours=3)).isoformat()
+            "start": (FUTURE_START + timedelta(hours=1)).isoformat(),
+            "end": (FUTURE_START + timedelta(hours=3)).isoformat()
         }
     )
     assert conflict_response.status_code == 200
@@ -2,6 +2,7 @@
 Tests for inventory management API endpoints
 """
 import pytest
+from sqlalchemy import event
 from fastapi.testclient import TestClient
 
 
@@ -69,49 +70,60 @@ def test_create_site(client):
     return data["id"]
 
 
-@pytest.fixture
-def device_type_id(client):
-    """Fixture: Create and return device type ID"""
-    response = client.post(
-        "/api/inventory/device-types",
-        json={
-            "name": "ROADM",
-            "category": "OPTICAL",
-            "description": "Reconfigurable Optical Add-Drop Multiplexer",
-            "is_schedulable": True,
-            "has_ports": True
-        }
-    )
-    assert response.status_code == 201
-    return response.json()["id"]
+def _create_shared(module_db, obj):
+    """Insert a prerequisite row once for the whole module and return its ID"""
+    # Tests only reference these rows by ID and never modify them
+    module_db.add(obj)
+    module_db.commit()
+    return obj.id
 
 
-@pytest.fixture
-def manufacturer_id(client):
-    """Fixture: Create and return manufacturer ID"""
-    response = client.post(
-        "/api/inventory/manufacturers",
-        json={
-            "name": "Juniper",
-            "website": "https://www.juniper.net"
-        }
-    )
-    assert response.status_code == 201
-    return response.json()["id"]
+@pytest.fixture(scope="module")
+def device_type_id(module_db):
+    """Fixture: Create and return device type ID (once per module)"""
+    return _create_shared(module_db, inventory_models.DeviceType(
+        name="ROADM",
+        category="OPTICAL",
+        description="Reconfigurable Optical Add-Drop Multiplexer",
+        is_schedulable=True,
+        has_ports=True
+    ))
+
+
+@pytest.fixture(scope="module")
+def manufacturer_id(module_db):
+    """Fixture: Create and return manufacturer ID (once per module)"""
+    return _create_shared(module_db, inventory_models.Manufacturer(
+        name="Juniper",
+        website="https://www.juniper.net"
+    ))
+
+
+@pytest.fixture(scope="module")
+def site_id(module_db):
+    """Fixture: Create and return site ID (once per module)"""
+    return _create_shared(module_db, inventory_models.Site(
+        name="Test Site",
+        address="Test Address"
+    ))
 
 
 @pytest.fixture
-def site_id(client):
-    """Fixture: Create and return site ID"""
-    response = client.post(
-        "/api/inventory/sites",
-        json={
-            "name": "Test Site",
-            "address": "Test Address"
+def make_device(db_session, device_type_id, manufacturer_id, site_id):
+    """Factory: insert an active device directly, skipping the create endpoint"""
+    def _make_device(**overrides):
+        fields = {
+            "device_type_id": device_type_id,
+            "manufacturer_id": manufacturer_id,
+            "site_id": site_id,
+            "status": "active",
         }
-    )
-    assert response.status_code == 201
-    return response.json()["id"]
+        fields.update(overrides)
+        device = inventory_models.InventoryDevice(**fields)
+        db_session.add(device)
+        db_session.flush()
+        return device
+    return _make_device
 
 
 def test_create_device(client, device_type_id, manufacturer_id, site_id):
@@ -150,21 +162,10 @@ def test_create_device(client, device_type_id, manufacturer_id, site_id):
     return data["id"]
 
 
-def test_get_device_by_id(client, device_type_id, manufacturer_id, site_id):
+def test_get_device_by_id(client, make_device, device_type_id):
     """Test 5: Get Device by ID"""
     # First create a device
-    create_response = client.post(
-        "/api/inventory/devices",
-        json={
-            "name": "Device-Get-Test",
-            "device_type_id": device_type_id,
-            "manufacturer_id": manufacturer_id,
-            "status": "active",
-            "site_id": site_id
-        }
-    )
-    assert create_response.status_code == 201
-    device_id = create_response.json()["id"]
+    device_id = make_device(name="Device-Get-Test").id
     
     # Now get it
     response = client.get(f"/api/inventory/devices/{device_id}")
@@ -290,21 +291,10 @@ def test_filter_devices(client, device_type_id, manufacturer_id, site_id):
     assert any("Active" in item["name"] for item in data["items"])
 
 
-def test_update_device(client, device_type_id, manufacturer_id, site_id):
+def test_update_device(client, make_device):
     """Test 9: Update Device"""
     # Create a device
-    create_response = client.post(
-        "/api/inventory/devices",
-        json={
-            "name": "Device-Update-Test",
-            "device_type_id": device_type_id,
-            "manufacturer_id": manufacturer_id,
-            "status": "active",
-            "site_id": site_id
-        }
-    )
-    assert create_response.status_code == 201
-    device_id = create_response.json()["id"]
+    device_id = make_device(name="Device-Update-Test").id
     
     # Update the device
     update_response = client.put(
@@ -329,21 +319,10 @@ def test_update_device(client, device_type_id, manufacturer_id, site_id):
     assert verify_data["hostname"] == "updated-hostname.lab.local"
 
 
-def test_delete_device(client, device_type_id, manufacturer_id, site_id):
+def test_delete_device(client, make_device):
     """Test 10: Delete Device"""
     # Create a device
-    create_response = client.post(
-        "/api/inventory/devices",
-        json={
-            "name": "Device-Delete-Test",
-            "device_type_id": device_type_id,
-            "manufacturer_id": manufacturer_id,
-            "status": "active",
-            "site_id": site_id
-        }
-    )
-    assert create_response.status_code == 201
-    device_id = create_response.json()["id"]
+    device_id = make_device(name="Device-Delete-Test").id
     
     # Delete the device
     delete_response = client.delete(f"/api/inventory/devices/{device_id}")
@@ -373,36 +352,20 @@ def test_create_tag(client):
     return data["id"]
 
 
-@pytest.fixture
-def tag_id(client):
-    """Fixture: Create and return tag ID"""
-    response = client.post(
-        "/api/inventory/tags",
-        json={
-            "name": "test-tag",
-            "description": "Test tag",
-            "color": "#00FF00"
-        }
-    )
-    assert response.status_code == 201
-    return response.json()["id"]
+@pytest.fixture(scope="module")
+def tag_id(module_db):
+    """Fixture: Create and return tag ID (once per module)"""
+    return _create_shared(module_db, inventory_models.Tag(
+        name="test-tag",
+        description="Test tag",
+        color="#00FF00"
+    ))
 
 
-def test_assign_tag_to_device(client, device_type_id, manufacturer_id, site_id, tag_id):
+def test_assign_tag_to_device(client, make_device, tag_id):
     """Test 12: Assign Tag to Device"""
     # Create a device
-    create_response = client.post(
-        "/api/inventory/devices",
-        json={
-            "name": "Device-Tag-Test",
-            "device_type_id": device_type_id,
-            "manufacturer_id": manufacturer_id,
-            "status": "active",
-            "site_id": site_id
-        }
-    )
-    assert create_response.status_code == 201
-    device_id = create_response.json()["id"]
+    device_id = make_device(name="Device-Tag-Test").id
     
     # Assign tag to device
     assign_response = client.post(
@@ -428,21 +391,10 @@ def test_assign_tag_to_device(client, device_type_id, manufacturer_id, site_id,
     assert tag_id in device_tag_ids
 
 
-def test_remove_tag_from_device(client, device_type_id, manufacturer_id, site_id, tag_id):
+def test_remove_tag_from_device(client, make_device, tag_id):
     """Test 13: Remove Tag from Device"""
     # Create a device
-    create_response = client.post(
-        "/api/inventory/devices",
-        json={
-            "name": "Device-Remove-Tag-Test",
-            "device_type_id": device_type_id,
-            "manufacturer_id": manufacturer_id,
-            "status": "active",
-            "site_id": site_id
-        }
-    )
-    assert create_response.status_code == 201
-    device_id = create_response.json()["id"]
+    device_id = make_device(name="Device-Remove-Tag-Test").id
     
     # Assign tag first
     client.post(
@@ -480,21 +432,10 @@ def test_list_tags(client, tag_id):
     assert tag_id in tag_ids
 
 
-def test_device_history(client, device_type_id, manufacturer_id, site_id):
+def test_device_history(client, make_device):
     """Test 15: Device History Endpoint"""
     # Create a device
-    create_response = client.post(
-        "/api/inventory/devices",
-        json={
-            "name": "Device-History-Test",
-            "device_type_id": device_type_id,
-            "manufacturer_id": manufacturer_id,
-            "status": "active",
-            "site_id": site_id
-        }
-    )
-    assert create_response.status_code == 201
-    device_id = create_response.json()["id"]
+    device_id = make_device(name="Device-History-Test").id
     
     # Update the device to generate history
     client.put(
@@ -669,3 +610,83 @@ def test_bulk_update_devices(client, device_type_id, manufacturer_id, site_id):
     assert device1_response.json()["status"] == "in_maintenance"
     assert device1_response.json()["notes"] == "Bulk updated"
 
+
+
+def _count_list_queries(client, db_session, path="/api/inventory/devices"):
+    """Return the number of SQL statements a GET (by default /devices) issues"""
+    statements = []
+    
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", _record)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(connection, "before_cursor_execute", _record)
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_list_devices_query_count_is_constant(client, db_session, device_type_id, manufacturer_id, site_id, tag_id):
+    """Test: Listing devices does not issue extra queries per device"""
+    def create_tagged_device(name):
+        response = client.post(
+            "/api/inventory/devices",
+            json={
+                "name": name,
+                "device_type_id": device_type_id,
+                "manufacturer_id": manufacturer_id,
+                "status": "active",
+                "site_id": site_id
+            }
+        )
+        assert response.status_code == 201
+        client.post(f"/api/inventory/devices/{response.json()['id']}/tags", json={"tag_ids": [tag_id]})
+    
+    create_tagged_device("Device-Queries-1")
+    baseline = _count_list_queries(client, db_session)
+    
+    for i in range(2, 6):
+        create_tagged_device(f"Device-Queries-{i}")
+    assert _count_list_queries(client, db_session) == baseline
+
+
+def test_get_device_query_count_ignores_tags(client, db_session, make_device, tag_id):
+    """Test: Getting one device does not issue a query per tag"""
+    device_id = make_device(name="Device-Tag-Queries").id
+    path = f"/api/inventory/devices/{device_id}"
+    client.post(f"{path}/tags", json={"tag_ids": [tag_id]})
+    baseline = _count_list_queries(client, db_session, path)
+    
+    extra_tag_ids = []
+    for i in range(3):
+        response = client.post("/api/inventory/tags", json={"name": f"query-tag-{i}"})
+        assert response.status_code == 201
+        extra_tag_ids.append(response.json()["id"])
+    client.post(f"{path}/tags", json={"tag_ids": extra_tag_ids})
+    
+    assert _count_list_queries(client, db_session, path) == baseline
+
+
+def test_bulk_update_reports_missing_devices(client, device_type_id):
+    """Test: Bulk update skips unknown IDs and records history for the rest"""
+    create_response = client.post(
+        "/api/inventory/devices",
+        json={"name": "Device-Bulk-Missing", "device_type_id": device_type_id, "status": "active"}
+    )
+    device_id = create_response.json()["id"]
+    
+    response = client.post(
+        "/api/inventory/devices/bulk-update",
+        json={"device_ids": [device_id, 999999], "updates": {"rack": "R7"}}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["succeeded"] == [device_id]
+    assert data["failed"] == [{"device_id": 999999, "error": "Device not found"}]
+    
+    assert client.get(f"/api/inventory/devices/{device_id}").json()["rack"] == "R7"
+    history = client.get(f"/api/inventory/devices/{device_id}/history").json()
+    assert "bulk_updated" in [entry["action"] for entry in history]
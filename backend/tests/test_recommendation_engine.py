@@ -0,0 +1,118 @@
+"""
+Tests for the recommendation engine service
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from backend.scheduler.models import Booking
+from backend.scheduler.services.recommendation_engine import RecommendationEngine
+
+
+def _add_booking(db_session, user, device, start_time, end_time, status="CONFIRMED"):
+    booking = Booking(
+        device_id=device.id,
+        user_id=user.id,
+        start_time=start_time,
+        end_time=end_time,
+        status=status,
+    )
+    db_session.add(booking)
+    db_session.commit()
+    return booking
+
+
+def test_earliest_slot_no_bookings(db_session, test_device):
+    """Device with no bookings is available immediately"""
+    engine = RecommendationEngine(db_session)
+    from_time = datetime(2030, 1, 1, 9, 0)
+
+    assert engine._find_earliest_available_slot(test_device.id, from_time, 7) == from_time
+
+
+def test_earliest_slot_finds_gap_between_bookings(db_session, test_user, test_device):
+    """The first gap in the merged busy intervals is returned"""
+    from_time = datetime(2030, 1, 1, 9, 0)
+    # Overlapping pair followed by a later booking leaves a gap at 14:00
+    _add_booking(db_session, test_user, test_device, from_time, from_time + timedelta(hours=3))
+    _add_booking(db_session, test_user, test_device, from_time + timedelta(hours=1), from_time + timedelta(hours=5))
+    _add_booking(db_session, test_user, test_device, from_time + timedelta(hours=8), from_time + timedelta(hours=10))
+
+    engine = RecommendationEngine(db_session)
+    slot = engine._find_earliest_available_slot(test_device.id, from_time, 7)
+
+    assert slot == from_time + timedelta(hours=5)
+
+
+def test_earliest_slot_after_last_booking(db_session, test_user, test_device):
+    """Back-to-back bookings push the slot past the last booking"""
+    from_time = datetime(2030, 1, 1, 9, 0)
+    _add_booking(db_session, test_user, test_device, from_time, from_time + timedelta(hours=2))
+    _add_booking(db_session, test_user, test_device, from_time + timedelta(hours=2), from_time + timedelta(hours=4))
+
+    engine = RecommendationEngine(db_session)
+    slot = engine._find_earliest_available_slot(test_device.id, from_time, 7)
+
+    assert slot == from_time + timedelta(hours=4, minutes=1)
+
+
+def _mapping(mapping_id, fit_score):
+    return {
+        'mapping_id': mapping_id,
+        'node_mappings': [{'logical_node_id': 'n1', 'fit_score': fit_score}],
+        'link_mappings': [],
+    }
+
+
+def test_suggest_topology_configurations_empty(db_session):
+    """No base mappings yields no suggestions"""
+    engine = RecommendationEngine(db_session)
+    start = datetime(2030, 1, 1, 9, 0)
+
+    assert engine.suggest_topology_configurations([], [], start, start + timedelta(hours=2), []) == []
+    assert engine.suggestions_truncated is False
+
+
+def test_suggest_topology_configurations_keeps_top_candidates(db_session):
+    """Only the best raw-fit mappings are scored when over the candidate limit"""
+    engine = RecommendationEngine(db_session)
+    start = datetime(2030, 1, 1, 9, 0)
+    base_mappings = [_mapping(f"m{i}", i / 10) for i in range(5)]
+
+    suggestions = engine.suggest_topology_configurations(
+        [], [], start, start + timedelta(hours=2), base_mappings, max_candidates=2
+    )
+
+    assert engine.suggestions_truncated is True
+    assert {s['mapping_id'] for s in suggestions} == {"m4", "m3"}
+
+
+def test_suggest_topology_configurations_default_limit(db_session):
+    """More base mappings than MAX_SUGGESTION_CANDIDATES are cut to the limit and flagged"""
+    engine = RecommendationEngine(db_session)
+    start = datetime(2030, 1, 1, 9, 0)
+    limit = RecommendationEngine.MAX_SUGGESTION_CANDIDATES
+    base_mappings = [_mapping(f"m{i}", i / 100) for i in range(limit + 5)]
+
+    suggestions = engine.suggest_topology_configurations(
+        [], [], start, start + timedelta(hours=2), base_mappings
+    )
+
+    assert engine.suggestions_truncated is True
+    assert len(suggestions) == limit
+    assert "m0" not in {s['mapping_id'] for s in suggestions}
+
+
+def test_historical_booking_stats_by_device(db_session, test_user, test_device):
+    """Stats are aggregated over the device's recent bookings"""
+    start = datetime.utcnow() - timedelta(days=2)
+    _add_booking(db_session, test_user, test_device, start, start + timedelta(hours=2))
+    _add_booking(db_session, test_user, test_device, start, start + timedelta(hours=4), status="CANCELLED")
+
+    engine = RecommendationEngine(db_session)
+    stats = engine.get_historical_booking_stats(device_id=test_device.id)
+
+    assert stats['total_bookings'] == 2
+    assert stats['success_rate'] == 0.5
+    assert stats['cancellation_rate'] == 0.5
+    assert stats['average_duration_hours'] == 3.0
+    assert engine.get_historical_booking_stats(device_type=test_device.deviceType)['total_bookings'] == 2
@@ -24,6 +24,5 @@ def test_safety_check_warns_on_non_test_database():
 def test_database_override_works(client):
     """Verify that database override prevents production DB access"""
     # The client fixture should have database override in place
-    # This is verified in the fixture itself with assertions
+    # (checked in test_conftest.py)
     assert client is not None
-
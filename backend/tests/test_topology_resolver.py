@@ -0,0 +1,275 @@
+"""
+Tests for the topology resolver service
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from backend.inventory.models import DeviceType, InventoryDevice
+from backend.scheduler.models import Booking
+from backend.scheduler.services.topology_resolver import (
+    TYPE_ID,
+    TopologyResolver,
+    _build_logical_adj,
+    _logical_edges_key,
+)
+
+
+START = datetime(2030, 1, 1, 9, 0)
+END = START + timedelta(hours=4)
+
+
+@pytest.fixture
+def physical_inventory(db_session):
+    """Two ROADMs, a fiber and an OTDR"""
+    types = {
+        name: DeviceType(name=name, category="OPTICAL")
+        for name in ("ROADM", "Fiber", "OTDR")
+    }
+    db_session.add_all(types.values())
+    db_session.flush()
+
+    devices = [
+        InventoryDevice(name="roadm-1", device_type_id=types["ROADM"].id, status="Available"),
+        InventoryDevice(name="roadm-2", device_type_id=types["ROADM"].id, status="Available"),
+        InventoryDevice(name="fiber-1", device_type_id=types["Fiber"].id, status="Available"),
+        InventoryDevice(name="otdr-1", device_type_id=types["OTDR"].id, status="Maintenance"),
+    ]
+    db_session.add_all(devices)
+    db_session.commit()
+    return {device.name: device.id for device in devices}
+
+
+def test_build_physical_graph_edges(db_session, physical_inventory):
+    """Only compatible device types are connected"""
+    resolver = TopologyResolver(db_session)
+    graph = resolver.build_physical_graph(START, END)
+
+    roadm_1, roadm_2 = physical_inventory["roadm-1"], physical_inventory["roadm-2"]
+    fiber, otdr = physical_inventory["fiber-1"], physical_inventory["otdr-1"]
+
+    assert set(graph.nodes) == set(physical_inventory.values())
+    assert graph.has_edge(roadm_1, fiber)
+    assert graph.has_edge(roadm_2, fiber)
+    assert graph.has_edge(fiber, otdr)
+    assert not graph.has_edge(roadm_1, roadm_2)
+    assert not graph.has_edge(roadm_1, otdr)
+    assert graph.nodes[otdr]["available"] is False
+
+
+def test_resolve_topology(db_session, physical_inventory):
+    """Each strategy maps logical nodes onto distinct available devices"""
+    resolver = TopologyResolver(db_session)
+    logical_nodes = [
+        {"id": "a", "deviceType": "ROADM"},
+        {"id": "f", "deviceType": "Fiber"},
+        {"id": "b", "deviceType": "roadm"},
+    ]
+    logical_edges = [
+        {"id": "a-f", "source": "a", "target": "f"},
+        {"id": "f-b", "source": "f", "target": "b"},
+        {"id": "a-b", "source": "a", "target": "b"},
+    ]
+
+    mappings = resolver.resolve_topology(logical_nodes, logical_edges, START, END)
+
+    assert {m["mapping_id"] for m in mappings} == {
+        "greedy-best-fit", "balanced-distribution", "connection-optimized"
+    }
+    greedy = next(m for m in mappings if m["mapping_id"] == "greedy-best-fit")
+    mapped = {nm["logical_node_id"]: nm["physical_device_id"] for nm in greedy["node_mappings"]}
+    assert mapped["f"] == physical_inventory["fiber-1"]
+    assert {mapped["a"], mapped["b"]} == {physical_inventory["roadm-1"], physical_inventory["roadm-2"]}
+
+    links = {lm["logical_edge_id"]: lm for lm in greedy["link_mappings"]}
+    assert links["a-f"]["fit_score"] == 1.0
+    assert links["a-b"]["fit_score"] == 0.8
+    assert links["a-b"]["explanation"] == "Indirect connection (path length: 2)"
+
+
+def test_resolve_topology_without_candidates(db_session, physical_inventory):
+    """Logical nodes with no available device type produce no mappings"""
+    resolver = TopologyResolver(db_session)
+
+    assert resolver.resolve_topology([{"id": "x", "deviceType": "Switch"}], [], START, END) == []
+
+
+def test_match_logical_node_cache_isolated(db_session, physical_inventory):
+    """Mutating returned candidates does not leak into later matches"""
+    resolver = TopologyResolver(db_session)
+    resolver.build_physical_graph(START, END)
+    node = {"id": "a", "deviceType": "ROADM"}
+    pool = [physical_inventory["roadm-1"], physical_inventory["roadm-2"]]
+
+    first = resolver.match_logical_node(node, pool)
+    first[0]["fit_score"] = 0.0
+
+    second = resolver.match_logical_node(node, pool)
+    assert [c["fit_score"] for c in second] == [1.0, 1.0]
+
+
+def test_match_logical_node_cache_keyed_on_params(db_session, physical_inventory):
+    """Nodes sharing an id but not parameters get their own explanations"""
+    resolver = TopologyResolver(db_session)
+    resolver.build_physical_graph(START, END)
+    pool = [physical_inventory["fiber-1"]]
+
+    plain = resolver.match_logical_node({"id": "f", "deviceType": "Fiber"}, pool)
+    with_length = resolver.match_logical_node(
+        {"id": "f", "deviceType": "Fiber", "parameters": {"length": 10}}, pool
+    )
+
+    assert "Attributes" not in plain[0]["explanation"]
+    assert with_length[0]["explanation"].endswith("Attributes: Length: acceptable")
+
+
+def test_build_physical_graph_marks_booked_devices(db_session, physical_inventory, test_user):
+    """Devices with an overlapping active booking are unavailable"""
+    roadm_1 = physical_inventory["roadm-1"]
+    db_session.add_all([
+        Booking(device_id=roadm_1, user_id=test_user.id, start_time=START - timedelta(hours=1),
+                end_time=START + timedelta(hours=1), status="CONFIRMED"),
+        Booking(device_id=physical_inventory["roadm-2"], user_id=test_user.id, start_time=END,
+                end_time=END + timedelta(hours=1), status="CONFIRMED"),
+        Booking(device_id=physical_inventory["fiber-1"], user_id=test_user.id, start_time=START,
+                end_time=END, status="CANCELLED"),
+    ])
+    db_session.commit()
+
+    graph = TopologyResolver(db_session).build_physical_graph(START, END)
+
+    assert graph.nodes[roadm_1]["available"] is False
+    assert graph.nodes[physical_inventory["roadm-2"]]["available"] is True
+    assert graph.nodes[physical_inventory["fiber-1"]]["available"] is True
+
+
+def test_maintenance_window_marks_device_unavailable(db_session, physical_inventory):
+    """Maintenance windows overlapping the range make the device unavailable"""
+    fiber = db_session.get(InventoryDevice, physical_inventory["fiber-1"])
+    fiber.maintenance_start = "All Day/2030-01-01"
+    fiber.maintenance_end = "All Day/2030-01-02"
+    roadm = db_session.get(InventoryDevice, physical_inventory["roadm-1"])
+    roadm.maintenance_start = "All Day/not-a-date"
+    roadm.maintenance_end = "All Day/2030-01-02"
+    db_session.commit()
+
+    graph = TopologyResolver(db_session).build_physical_graph(START, END)
+
+    assert graph.nodes[physical_inventory["fiber-1"]]["in_maintenance"] is True
+    assert graph.nodes[physical_inventory["roadm-1"]]["in_maintenance"] is False
+
+
+@pytest.mark.parametrize("type1,type2,expected", [
+    ("ROADM", "Fiber", True),
+    ("fiber", "OTDR", True),
+    ("Switch", "Transceiver", True),
+    ("ILA", "Switch", False),
+    ("ROADM", "ROADM", False),
+    ("ROADM", "Unknown", False),
+])
+def test_can_connect(db_session, type1, type2, expected):
+    """Compatibility is symmetric and unknown types never connect"""
+    resolver = TopologyResolver(db_session)
+
+    assert resolver._can_connect({"device_type": type1}, {"device_type": type2}) is expected
+    assert resolver._can_connect({"device_type": type2}, {"device_type": type1}) is expected
+
+
+def test_match_logical_node_explanations(db_session, physical_inventory):
+    """Public matches carry a joined explanation of the fit factors"""
+    resolver = TopologyResolver(db_session)
+    resolver.build_physical_graph(START, END)
+    node = {"id": "f", "deviceType": "Fiber", "parameters": {"length": 10}}
+
+    matches = resolver.match_logical_node(node, list(physical_inventory.values()))
+
+    assert [m["device_id"] for m in matches] == [physical_inventory["fiber-1"]]
+    assert matches[0]["explanation"] == (
+        "Type match: ✓ | Availability: ✓ | Status: ✓ | Attributes: Length: acceptable"
+    )
+    assert "factors" not in matches[0]
+
+
+def test_build_logical_adj_shared_across_calls():
+    """Equal edge lists, in any order, reuse one cached adjacency"""
+    edges = [{"source": "a", "target": "f"}, {"source": "f", "target": "b"}]
+
+    first = _build_logical_adj(_logical_edges_key(edges))
+    second = _build_logical_adj(_logical_edges_key(list(reversed(edges))))
+
+    assert first is second
+    assert first == {"a": {"f"}, "f": {"a", "b"}, "b": {"f"}}
+
+
+def test_resolve_topology_offers_each_strategy(db_session):
+    """Each heuristic strategy contributes an option, even with many devices"""
+    types = {name: DeviceType(name=name, category="OPTICAL") for name in ("ROADM", "Fiber")}
+    db_session.add_all(types.values())
+    db_session.flush()
+    db_session.add_all(
+        [InventoryDevice(name=f"fiber-{i}", device_type_id=types["Fiber"].id, status="Available") for i in range(10)]
+        + [InventoryDevice(name=f"roadm-{i}", device_type_id=types["ROADM"].id, status="Available") for i in range(10)]
+    )
+    db_session.commit()
+    resolver = TopologyResolver(db_session)
+    logical_nodes = [
+        {"id": "a", "deviceType": "ROADM"},
+        {"id": "f", "deviceType": "Fiber"},
+        {"id": "b", "deviceType": "ROADM"},
+    ]
+    logical_edges = [
+        {"id": "a-f", "source": "a", "target": "f"},
+        {"id": "f-b", "source": "f", "target": "b"},
+    ]
+
+    mappings = resolver.resolve_topology(logical_nodes, logical_edges, START, END, num_options=5)
+
+    assert {m["mapping_id"] for m in mappings} == {
+        "greedy-best-fit", "balanced-distribution", "connection-optimized"
+    }
+    for mapping in mappings:
+        links = {lm["logical_edge_id"]: lm for lm in mapping["link_mappings"]}
+        assert links["a-f"]["fit_score"] == 1.0
+        assert links["f-b"]["fit_score"] == 1.0
+
+
+def test_resolve_topology_incompatible_link_over_large_bucket(db_session):
+    """A logical link between types that cannot connect still resolves quickly"""
+    types = {name: DeviceType(name=name, category="OPTICAL") for name in ("ROADM", "Fiber")}
+    db_session.add_all(types.values())
+    db_session.flush()
+    db_session.add_all(
+        [InventoryDevice(name=f"fiber-{i}", device_type_id=types["Fiber"].id, status="Available") for i in range(30)]
+        + [InventoryDevice(name=f"roadm-{i}", device_type_id=types["ROADM"].id, status="Available") for i in range(4)]
+    )
+    db_session.commit()
+    resolver = TopologyResolver(db_session)
+    logical_nodes = [{"id": f"f{i}", "deviceType": "Fiber"} for i in range(6)] + [
+        {"id": "a", "deviceType": "ROADM"},
+        {"id": "b", "deviceType": "ROADM"},
+    ]
+    logical_edges = [{"id": "a-b", "source": "a", "target": "b"}]
+
+    mappings = resolver.resolve_topology(logical_nodes, logical_edges, START, END)
+
+    assert mappings
+    for mapping in mappings:
+        assert mapping["link_mappings"][0]["fit_score"] < 1.0
+
+
+@pytest.mark.parametrize("device_type,expected", [
+    ("Fiber", ("Length: acceptable",)),
+    ("ILA", ("Gain: acceptable",)),
+    ("ROADM", ()),
+    ("Unknown", ("Length: acceptable", "Gain: acceptable")),
+])
+def test_fit_factors_param_checks_by_type(db_session, device_type, expected):
+    """Only the parameters relevant to the device type are reported"""
+    resolver = TopologyResolver(db_session)
+    type_lc = device_type.lower()
+    attrs = {"available": True, "status_lc": "available", "type_id": TYPE_ID.get(type_lc, -1)}
+    params = {"length": 10, "gain": 20, "ports": 8, "vendor": "Acme"}
+
+    factors = resolver._fit_factors(attrs, params)
+
+    attributes = [f for f in factors if f.startswith("Attributes: ")]
+    assert attributes == ([f"Attributes: {' | '.join(expected)}"] if expected else [])
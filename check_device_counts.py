@@ -1,30 +1,24 @@
 #!/usr/bin/env python3
-"""Check database row counts for device tables."""
+"""Check database row counts for device tables.
 
-import os
-import sys
+Counts are MySQL statistics estimates by default; pass --exact for COUNT(*).
+"""
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sys
 
-from sqlalchemy import create_engine, text
-from backend.core.database import DATABASE_URL
+from scripts._db import connect, exact_count, fast_count
 
-def check_device_counts():
+def check_device_counts(exact=False):
     """Check row counts for device_table and devices."""
-    engine = create_engine(DATABASE_URL)
-    
-    with engine.connect() as conn:
-        # Count device_table rows
-        result = conn.execute(text("SELECT COUNT(*) FROM device_table;"))
-        device_table_count = result.scalar()
-        
-        # Count devices rows
-        result = conn.execute(text("SELECT COUNT(*) FROM devices;"))
-        devices_count = result.scalar()
+    count = exact_count if exact else fast_count
+    with connect() as conn:
+        device_table_count = count(conn, "device_table")
+        devices_count = count(conn, "devices")
         
         print(f"device_table (legacy scheduler): {device_table_count} rows")
         print(f"devices (inventory): {devices_count} rows")
+        if not exact:
+            print("(estimated counts; run with --exact for COUNT(*))")
         print(f"\nCurrent source of truth: device_table ({device_table_count} rows)")
         
         if devices_count > 0:
@@ -33,4 +27,4 @@ def check_device_counts():
             print(f"devices table: empty / no data")
 
 if __name__ == "__main__":
-    check_device_counts()
+    check_device_counts(exact="--exact" in sys.argv[1:])
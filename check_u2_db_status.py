@@ -5,48 +5,63 @@ Verify device_table and devices table synchronization before migration.
 """
 
 import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine, text
-from backend.core.database import DATABASE_URL
+from sqlalchemy import text
+
+from scripts._db import connect
+from scripts._schema_cache import get_columns
+
+def _count_tables_separately(conn):
+    """Count each table on its own, reporting which one is unavailable."""
+    # Check device_table
+    try:
+        result = conn.execute(text("SELECT COUNT(*) FROM device_table;"))
+        device_table_count = result.scalar()
+        print(f"\n✓ device_table exists: {device_table_count} rows")
+    except Exception as e:
+        print(f"\n✗ device_table error: {e}")
+        device_table_count = 0
+    
+    # Check devices table
+    try:
+        result = conn.execute(text("SELECT COUNT(*) FROM devices;"))
+        devices_count = result.scalar()
+        print(f"✓ devices table exists: {devices_count} rows")
+    except Exception as e:
+        print(f"✗ devices table error: {e}")
+        devices_count = 0
+    
+    return device_table_count, devices_count
 
 def check_device_tables():
     """Check synchronization status between device_table and devices."""
-    engine = create_engine(DATABASE_URL)
-    
     print("=" * 80)
     print("Phase U2 Database Status Check")
     print("=" * 80)
     
-    with engine.connect() as conn:
-        # Check device_table
+    with connect() as conn:
+        # Both counts and the ID overlap in one round trip; if that fails
+        # (e.g. a table is missing) probe each table separately to report which
+        matching_ids = None
         try:
-            result = conn.execute(text("SELECT COUNT(*) FROM device_table;"))
-            device_table_count = result.scalar()
+            device_table_count, devices_count, matching_ids = conn.execute(text("""
+                SELECT
+                    (SELECT COUNT(*) FROM device_table) AS device_table_count,
+                    (SELECT COUNT(*) FROM devices) AS devices_count,
+                    (SELECT COUNT(*) FROM device_table dt
+                     INNER JOIN devices d ON dt.id = d.id) AS matching_ids;
+            """)).one()
             print(f"\n✓ device_table exists: {device_table_count} rows")
-        except Exception as e:
-            print(f"\n✗ device_table error: {e}")
-            device_table_count = 0
-        
-        # Check devices table
-        try:
-            result = conn.execute(text("SELECT COUNT(*) FROM devices;"))
-            devices_count = result.scalar()
             print(f"✓ devices table exists: {devices_count} rows")
-        except Exception as e:
-            print(f"✗ devices table error: {e}")
-            devices_count = 0
+        except Exception:
+            device_table_count, devices_count = _count_tables_separately(conn)
         
         # Check if maintenance columns exist
         try:
-            result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'devices' 
-                AND column_name IN ('maintenance_start', 'maintenance_end');
-            """))
-            maint_columns = [row[0] for row in result]
+            maint_columns = [
+                column for column in get_columns(conn, "devices")
+                if column in ("maintenance_start", "maintenance_end")
+            ]
             if len(maint_columns) == 2:
                 print(f"✓ Maintenance columns exist in devices table")
             else:
@@ -57,11 +72,12 @@ def check_device_tables():
         # Check ID overlap (are device IDs synchronized?)
         if device_table_count > 0 and devices_count > 0:
             try:
-                result = conn.execute(text("""
-                    SELECT COUNT(*) FROM device_table dt
-                    INNER JOIN devices d ON dt.id = d.id;
-                """))
-                matching_ids = result.scalar()
+                if matching_ids is None:
+                    result = conn.execute(text("""
+                        SELECT COUNT(*) FROM device_table dt
+                        INNER JOIN devices d ON dt.id = d.id;
+                    """))
+                    matching_ids = result.scalar()
                 print(f"\n✓ Matching IDs: {matching_ids} devices have same ID in both tables")
                 
                 if matching_ids != min(device_table_count, devices_count):
@@ -0,0 +1,70 @@
+"""
+On-disk cache of information_schema column lookups for the diagnostic scripts.
+
+information_schema.columns is slow to query on MySQL. Column lists are cached
+per (database, table) and reused while the table's CREATE_TIME/UPDATE_TIME
+are unchanged and the entry is younger than CACHE_TTL_SECONDS.
+"""
+
+import json
+import os
+import time
+
+from sqlalchemy import text
+
+CACHE_PATH = os.path.expanduser("~/.cache/openireland/schema.json")
+CACHE_TTL_SECONDS = 3600
+
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # The cache is an optimisation only
+
+
+def _query_columns(conn, table):
+    result = conn.execute(
+        text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = :table "
+            "ORDER BY ordinal_position"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result]
+
+
+def get_columns(conn, table):
+    """Column names of `table` in the connection's current MySQL database."""
+    stamp_row = conn.execute(
+        text(
+            "SELECT CREATE_TIME, UPDATE_TIME FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = :table"
+        ),
+        {"table": table},
+    ).first()
+    if stamp_row is None:
+        return []  # No such table
+    stamp = [str(value) for value in stamp_row]
+
+    key = f"{conn.engine.url.render_as_string(hide_password=True)}#{table}"
+    cache = _load_cache()
+    entry = cache.get(key)
+    if entry and entry["stamp"] == stamp and time.time() - entry["cached_at"] < CACHE_TTL_SECONDS:
+        return entry["columns"]
+
+    columns = _query_columns(conn, table)
+    cache[key] = {"stamp": stamp, "cached_at": time.time(), "columns": columns}
+    _save_cache(cache)
+    return columns
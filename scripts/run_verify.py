@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Run the verify_*.py scripts side by side.
+
+Each script spends its time waiting on MySQL round trips, so running them
+concurrently takes about as long as the slowest one instead of the sum.
+Every script runs in its own process (with its own pooled engine); output is
+captured and printed per script, in the order given, once all have finished.
+
+Passes are cached in CACHE_PATH, keyed on the script, the model and schema
+sources and the server's @@global.gtid_executed (which moves on every
+committed write). A script whose key is unchanged is reported as a cached
+pass and not run. Without GTIDs there is no reliable change marker, so
+nothing is cached.
+
+A run only counts as a pass when it exits 0 and its output has none of
+FAILURE_MARKERS, so a script that prints an error and exits 0 anyway is
+neither reported nor cached as a pass.
+
+Usage: python scripts/run_verify.py [--no-cache] [script.py ...]
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SCRIPTS = [
+    "verify_backend_logic.py",
+    "verify_bookings_query.py",
+    "verify_phase_8_5.py",
+    "verify_u2_db.py",
+]
+
+# Per-script limit so one hung connection cannot stall the whole run
+TIMEOUT_SECONDS = 300
+
+CACHE_PATH = os.path.expanduser("~/.cache/openireland/verify.json")
+
+# Sources whose changes invalidate every cached pass
+MODEL_SOURCES = [
+    "backend/scheduler/models.py",
+    "backend/scheduler/schemas.py",
+    "backend/inventory/models.py",
+]
+
+# Lines the verify scripts print when a check fails
+FAILURE_MARKERS = (
+    "✗",
+    "FAILED",
+    "Failed to serialize",
+    "CRITICAL FAILURE",
+    "ERROR:",
+    "Traceback (most recent call last)",
+)
+
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # The cache is an optimisation only
+
+
+def _db_marker():
+    """DATABASE_URL plus the server's GTID set, or None if unavailable"""
+    sys.path.insert(0, str(REPO_ROOT))
+    try:
+        from sqlalchemy import text
+        from scripts._db import DATABASE_URL, connect
+
+        with connect() as conn:
+            gtids = conn.execute(text("SELECT @@global.gtid_executed")).scalar()
+    except Exception:
+        return None
+    return f"{DATABASE_URL}#{gtids}" if gtids else None
+
+
+def _cache_key(name, db_marker):
+    digest = hashlib.sha1()
+    for path in [name, *MODEL_SOURCES]:
+        try:
+            digest.update((REPO_ROOT / path).read_bytes())
+        except OSError:
+            pass
+    digest.update(db_marker.encode())
+    return digest.hexdigest()
+
+
+def run_script(name):
+    """Run one script from the repo root; return (exit code, combined output)"""
+    try:
+        proc = subprocess.run(
+            [sys.executable, name],
+            cwd=REPO_ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=TIMEOUT_SECONDS,
+        )
+    except subprocess.TimeoutExpired as e:
+        # The partial output arrives as bytes here even with text=True
+        partial = e.output.decode(errors="replace") if isinstance(e.output, bytes) else (e.output or "")
+        return 1, f"{partial}\nTimed out after {TIMEOUT_SECONDS}s"
+    return proc.returncode, proc.stdout
+
+
+def _passed(code, output):
+    """True for a clean exit with no failure printed along the way"""
+    return code == 0 and not any(marker in output for marker in FAILURE_MARKERS)
+
+
+def run_all(scripts, use_cache=True):
+    db_marker = _db_marker() if use_cache else None
+    cache = _load_cache() if db_marker else {}
+    keys = {name: _cache_key(name, db_marker) for name in scripts} if db_marker else {}
+
+    to_run = [name for name in scripts if name not in keys or cache.get(name) != keys[name]]
+    results = {}
+    if to_run:
+        with ThreadPoolExecutor(max_workers=len(to_run)) as ex:
+            results = dict(zip(to_run, ex.map(run_script, to_run)))
+
+    failed = []
+    for name in scripts:
+        print("=" * 80)
+        if name not in results:
+            print(f"{name}: CACHED PASS")
+            print("=" * 80)
+            continue
+        code, output = results[name]
+        print(f"{name} (exit {code})")
+        print("=" * 80)
+        print(output)
+        if not _passed(code, output):
+            failed.append(name)
+            cache.pop(name, None)
+        elif name in keys:
+            cache[name] = keys[name]
+
+    if db_marker:
+        _save_cache(cache)
+
+    if failed:
+        print(f"✗ Failed: {', '.join(failed)}")
+        return 1
+    print(f"✅ All {len(scripts)} verify scripts passed")
+    return 0
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    use_cache = "--no-cache" not in args
+    scripts = [arg for arg in args if arg != "--no-cache"]
+    sys.exit(run_all(scripts or DEFAULT_SCRIPTS, use_cache=use_cache))
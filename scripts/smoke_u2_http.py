@@ -7,12 +7,28 @@ Tests Phase U2 endpoints without requiring docker exec.
 import requests
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:8000"
 
+# (connect, read) seconds, so a hung server fails the run instead of stalling it
+TIMEOUT = (1, 5)
+
+# One keep-alive session for all checks: the TCP (and TLS) setup happens once
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 def test_health():
     """Test basic health endpoint"""
-    response = requests.get(f"{BASE_URL}/health")
+    response = SESSION.get(f"{BASE_URL}/health", timeout=TIMEOUT)
     print(f"✓ Health check: {response.status_code}")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
@@ -22,9 +38,9 @@ def test_db_status(session=None):
     url = f"{BASE_URL}/admin/v2/debug/db-status"
     
     if session:
-        response = requests.get(url, cookies=session)
+        response = SESSION.get(url, cookies=session, timeout=TIMEOUT)
     else:
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=TIMEOUT)
     
     print(f"\n{'='*80}")
     print("DB Status Verification")
@@ -48,7 +64,7 @@ def test_db_status(session=None):
 
 def test_inventory_devices():
     """Test inventory devices endpoint"""
-    response = requests.get(f"{BASE_URL}/api/inventory/devices?limit=1")
+    response = SESSION.get(f"{BASE_URL}/api/inventory/devices?limit=1", timeout=TIMEOUT)
     
     if response.status_code == 401:
         print("✓ Inventory devices (auth required)")
@@ -61,7 +77,7 @@ def test_inventory_devices():
 
 def test_docs():
     """Test API docs endpoint"""
-    response = requests.get(f"{BASE_URL}/docs")
+    response = SESSION.get(f"{BASE_URL}/docs", timeout=TIMEOUT)
     print(f"✓ API docs: {response.status_code}")
     assert response.status_code == 200
 
@@ -72,10 +88,13 @@ def run_smoke_tests():
     print("="*80)
     
     try:
-        test_health()
-        test_docs()
-        test_inventory_devices()
-        db_data = test_db_status()
+        # The checks are independent GETs, so run them side by side on the
+        # shared session (its cookie jar is lock-protected; none of them log in)
+        checks = [test_health, test_docs, test_inventory_devices, test_db_status]
+        with ThreadPoolExecutor(max_workers=len(checks)) as ex:
+            futures = {ex.submit(fn): fn.__name__ for fn in checks}
+            results = {futures[f]: f.result() for f in as_completed(futures)}
+        db_data = results["test_db_status"]
         
         print("\n" + "="*80)
         print("Summary")
@@ -0,0 +1,74 @@
+"""
+Pytest configuration and fixtures for the repository-level test suites
+"""
+import os
+from contextlib import contextmanager
+
+# database.py requires DATABASE_URL at import time; the tests never use it
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.core.database import Base
+import backend.inventory.models  # noqa: F401  (registers the inventory tables)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """In-memory SQLite engine with the schema created once per run"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; issue BEGIN ourselves
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Session whose commits only release a SAVEPOINT; everything is rolled back"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def count_queries(db):
+    """Context manager recording the SQL statements ``db`` sends while open"""
+    @contextmanager
+    def _count_queries():
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        connection = db.connection()
+        event.listen(connection, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(connection, "before_cursor_execute", _record)
+
+    return _count_queries
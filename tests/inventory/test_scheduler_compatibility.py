@@ -6,9 +6,10 @@ Validates that all properties, queries, and serialization work correctly.
 """
 
 import pytest
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
-from backend.inventory.models import InventoryDevice, DeviceType
+from backend.inventory.models import InventoryDevice, DeviceType, parse_maintenance
 from backend.scheduler.schemas import DeviceResponse, DeviceCreate
 
 
@@ -31,22 +32,22 @@ class TestInventoryDeviceProperties:
         device.ip_address = "10.0.0.1"
         assert device.mgmt_ip == "10.0.0.1"
     
-    def test_status_property_mapping(self, db: Session):
-        """Test status property maps between inventory and scheduler values."""
-        device = InventoryDevice(_status_internal="active")
+    def test_status_stores_scheduler_values(self, db: Session):
+        """Test status is a plain column holding scheduler values."""
+        device_type = DeviceType(name="ROADM", category="OPTICAL")
+        db.add(device_type)
+        db.flush()
         
-        # Getter returns scheduler value
+        device = InventoryDevice(name="Test", device_type=device_type)
+        db.add(device)
+        db.flush()
+        
+        # Column default is the scheduler's "Available"
         assert device.status == "Available"
         
-        # Setter accepts scheduler value
         device.status = "Maintenance"
-        assert device._status_internal == "in_maintenance"
-        assert device.status == "Maintenance"
-        
-        # Round-trip test
-        device.status = "Unavailable"
-        assert device._status_internal == "retired"
-        assert device.status == "Unavailable"
+        db.flush()
+        assert db.query(InventoryDevice.status).filter(InventoryDevice.id == device.id).scalar() == "Maintenance"
     
     def test_port_properties(self, db: Session):
         """Test Out_Port and In_Port properties parse polatis_port_range."""
@@ -104,18 +105,25 @@ class TestDeviceTypeProperty:
         # device_type relationship not loaded
         assert device.deviceType is None or device.deviceType == "ROADM"  # Depends on if FK is set
     
-    def test_deviceType_setter(self, db: Session):
-        """Test deviceType setter looks up DeviceType."""
-        device_type = DeviceType(name="FIBER", category="OPTICAL")
-        db.add(device_type)
-        db.commit()
+    def test_deviceType_follows_relationship(self, db: Session):
+        """Test deviceType is read-only and follows device_type."""
+        roadm = DeviceType(name="ROADM", category="OPTICAL")
+        fiber = DeviceType(name="FIBER", category="OPTICAL")
+        db.add_all([roadm, fiber])
+        db.flush()
         
-        device = InventoryDevice(name="Test")
+        device = InventoryDevice(name="Test", device_type=roadm)
         db.add(device)
         db.flush()
         
-        device.deviceType = "FIBER"
-        assert device.device_type.name == "FIBER"
+        # The setter was removed in U2; callers assign device_type instead
+        with pytest.raises(AttributeError):
+            device.deviceType = "FIBER"
+        
+        device.device_type = fiber
+        db.flush()
+        assert device.device_type_id == fiber.id
+        assert device.deviceType == "FIBER"
 
 
 class TestDeviceTypeQueries:
@@ -134,7 +142,7 @@ class TestDeviceTypeQueries:
         roadm2 = InventoryDevice(name="ROADM-2", device_type=roadm_type)
         fiber1 = InventoryDevice(name="FIBER-1", device_type=fiber_type)
         db.add_all([roadm1, roadm2, fiber1])
-        db.commit()
+        db.flush()
         
         # Phase U2 query pattern: JOIN with DeviceType
         results = (
@@ -147,29 +155,39 @@ class TestDeviceTypeQueries:
         assert len(results) == 2
         assert all(d.deviceType == "ROADM" for d in results)
     
-    def test_eager_loading_prevents_n_plus_1(self, db: Session):
+    def test_eager_loading_prevents_n_plus_1(self, db: Session, count_queries):
         """Test eager loading with joinedload prevents N+1 queries."""
         # Create test data
         device_type = DeviceType(name="ROADM", category="OPTICAL")
         db.add(device_type)
         db.flush()
         
-        for i in range(10):
-            device = InventoryDevice(name=f"Device-{i}", device_type=device_type)
-            db.add(device)
-        db.commit()
+        # One executemany INSERT instead of a unit-of-work INSERT per device
+        db.execute(
+            insert(InventoryDevice),
+            [{"name": f"Device-{i}", "device_type_id": device_type.id} for i in range(10)],
+        )
         
-        # Query with eager loading
-        devices = (
-            db.query(InventoryDevice)
-            .options(joinedload(InventoryDevice.device_type))
-            .all()
+        # Count server-side rather than materializing every device
+        count = (
+            db.query(func.count(InventoryDevice.id))
+            .join(DeviceType)
+            .filter(DeviceType.name == "ROADM")
+            .scalar()
         )
+        assert count == 10
         
-        # Access deviceType should not trigger additional queries
-        # (In a real test, we'd use a query counter)
-        for d in devices:
-            assert d.deviceType == "ROADM"
+        # Spot-check one row: with joinedload, loading it and reading
+        # deviceType is a single statement (a lazy load would add a second)
+        db.expire_all()
+        with count_queries() as statements:
+            device = (
+                db.query(InventoryDevice)
+                .options(joinedload(InventoryDevice.device_type))
+                .first()
+            )
+            assert device.deviceType == "ROADM"
+        assert len(statements) == 1
 
 
 class TestPydanticSerialization:
@@ -188,12 +206,12 @@ class TestPydanticSerialization:
             mgmt_ip="192.168.1.1",
             polatis_port_range="In=123;Out=456",
             polatis_name="POL-1",
-            _status_internal="active",
+            status="Available",
             maintenance_start="All Day/2023-10-01",
             maintenance_end="All Day/2023-10-05"
         )
         db.add(device)
-        db.commit()
+        db.flush()
         
         # Eager load for serialization
         device = (
@@ -209,10 +227,10 @@ class TestPydanticSerialization:
         # Verify all fields
         assert response.deviceName == "Test ROADM"
         assert response.deviceType == "ROADM"
-        assert response.ip_address == "192.168.1.1"
+        assert str(response.ip_address) == "192.168.1.1"
         assert response.Out_Port == 456
         assert response.In_Port == 123
-        assert response.status == "Available"  # Mapped from "active"
+        assert response.status == "Available"
         assert response.maintenance_start == "All Day/2023-10-01"
         assert response.maintenance_end == "All Day/2023-10-05"
         assert response.polatis_name == "POL-1"
@@ -229,12 +247,8 @@ class TestMaintenanceParsing:
             maintenance_end="All Day/2023-10-05"
         )
         
-        # Test parsing (as done in topology_resolver)
-        start_str = device.maintenance_start.split("/")[-1]
-        end_str = device.maintenance_end.split("/")[-1]
-        
-        assert start_str == "2023-10-01"
-        assert end_str == "2023-10-05"
+        assert parse_maintenance(device.maintenance_start) == ("All Day", "2023-10-01")
+        assert parse_maintenance(device.maintenance_end) == ("All Day", "2023-10-05")
     
     def test_maintenance_format_time_segment(self, db: Session):
         """Test time segment maintenance format."""
@@ -244,19 +258,15 @@ class TestMaintenanceParsing:
             maintenance_end="12 PM - 6 PM/2023-10-05"
         )
         
-        assert "7 AM - 12 PM" in device.maintenance_start
-        assert "2023-10-01" in device.maintenance_start
-
-
-# Fixtures would go here in a real test suite
-@pytest.fixture
-def db():
-    """Database session fixture (placeholder)."""
-    # In real tests, this would create a test database session
-    from backend.core.database import SessionLocal
-    db = SessionLocal()
-    yield db
-    db.close()
+        assert parse_maintenance(device.maintenance_start) == ("7 AM - 12 PM", "2023-10-01")
+        assert parse_maintenance(device.maintenance_end) == ("12 PM - 6 PM", "2023-10-05")
+    
+    def test_parse_maintenance_rejects_malformed(self):
+        """Test empty or malformed maintenance values parse to (None, None)."""
+        assert parse_maintenance(None) == (None, None)
+        assert parse_maintenance("") == (None, None)
+        assert parse_maintenance("All Day") == (None, None)
+        assert parse_maintenance("All Day/2023-10") == (None, None)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
 Step 1: DB State Verification for U2 Stability Pass
+
+Table sizes are MySQL statistics estimates by default; pass --exact for COUNT(*).
 """
 import sys
 import os
@@ -8,63 +10,117 @@ import os
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-try:
-    from sqlalchemy import create_engine, text
-    from backend.core.database import DATABASE_URL
+MAINTENANCE_COLUMNS = ('maintenance_start', 'maintenance_end')
+
+EXACT_COUNT_SQL = "(SELECT COUNT(*) FROM {table})"
+# InnoDB's cached estimate: constant time, but only approximate
+ESTIMATED_COUNT_SQL = """(SELECT TABLE_ROWS FROM information_schema.tables
+         WHERE table_schema = DATABASE() AND table_name = '{table}')"""
+
+# Both counts, the ID overlap and the maintenance columns in one round trip
+SUMMARY_SQL = """
+    SELECT
+        {device_table_count} AS device_table_count,
+        {devices_count} AS devices_count,
+        (SELECT COUNT(*) FROM device_table dt
+         INNER JOIN devices d ON dt.id = d.id) AS matching,
+        (SELECT GROUP_CONCAT(column_name)
+         FROM information_schema.columns
+         WHERE table_schema = DATABASE() AND table_name = 'devices'
+         AND column_name IN ('maintenance_start', 'maintenance_end')) AS maintenance_columns;
+"""
+
+# Failed checks; any of them makes the script exit non-zero so
+# scripts/run_verify.py does not report a pass
+failures = []
+
+
+def _fail(message):
+    print(message)
+    failures.append(message)
+
+
+def _query_separately(conn):
+    """One query per check, so an error names the check that failed."""
+    try:
+        device_table_count = conn.execute(text('SELECT COUNT(*) FROM device_table;')).scalar()
+        print(f'\n✓ device_table: {device_table_count} rows')
+    except Exception as e:
+        _fail(f'\n✗ device_table error: {e}')
+        device_table_count = 0
+    
+    try:
+        devices_count = conn.execute(text('SELECT COUNT(*) FROM devices;')).scalar()
+        print(f'✓ devices table: {devices_count} rows')
+    except Exception as e:
+        _fail(f'✗ devices error: {e}')
+        devices_count = 0
     
-    engine = create_engine(DATABASE_URL)
+    try:
+        result = conn.execute(text("""
+            SELECT column_name 
+            FROM information_schema.columns 
+            WHERE table_name = 'devices' 
+            AND column_name IN ('maintenance_start', 'maintenance_end');
+        """))
+        cols = [r[0] for r in result]
+    except Exception as e:
+        _fail(f'✗ Column check error: {e}')
+        cols = None
+    
+    matching = None
+    if device_table_count > 0 and devices_count > 0:
+        try:
+            matching = conn.execute(text("""
+                SELECT COUNT(*) FROM device_table dt
+                INNER JOIN devices d ON dt.id = d.id;
+            """)).scalar()
+        except Exception as e:
+            _fail(f'✗ ID overlap error: {e}')
+    
+    return device_table_count, devices_count, cols, matching
+
+
+try:
+    from sqlalchemy import text
+    from scripts._db import connect
     
     print('=' * 80)
     print('Phase U2 Database Verification')
     print('=' * 80)
     
-    with engine.connect() as conn:
-        # Check device_table
-        try:
-            result = conn.execute(text('SELECT COUNT(*) FROM device_table;'))
-            device_table_count = result.scalar()
-            print(f'\n✓ device_table: {device_table_count} rows')
-        except Exception as e:
-            print(f'\n✗ device_table error: {e}')
-            device_table_count = 0
-        
-        # Check devices
+    exact = '--exact' in sys.argv[1:]
+    count_sql = EXACT_COUNT_SQL if exact else ESTIMATED_COUNT_SQL
+    summary_sql = SUMMARY_SQL.format(
+        device_table_count=count_sql.format(table='device_table'),
+        devices_count=count_sql.format(table='devices'),
+    )
+    
+    with connect() as conn:
         try:
-            result = conn.execute(text('SELECT COUNT(*) FROM devices;'))
-            devices_count = result.scalar()
-            print(f'✓ devices table: {devices_count} rows')
-        except Exception as e:
-            print(f'✗ devices error: {e}')
-            devices_count = 0
+            device_table_count, devices_count, matching, cols_csv = conn.execute(text(summary_sql)).one()
+            if device_table_count is None or devices_count is None:
+                # No statistics for a table (e.g. it is missing): count exactly below
+                raise LookupError('no table statistics')
+            cols = cols_csv.split(',') if cols_csv else []
+            estimate = '' if exact else ' (estimate)'
+            print(f'\n✓ device_table: {device_table_count} rows{estimate}')
+            print(f'✓ devices table: {devices_count} rows{estimate}')
+        except Exception:
+            # e.g. a missing table: fall back to separate queries to report which
+            device_table_count, devices_count, cols, matching = _query_separately(conn)
         
         # Check maintenance columns
-        try:
-            result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'devices' 
-                AND column_name IN ('maintenance_start', 'maintenance_end');
-            """))
-            cols = [r[0] for r in result]
+        if cols is not None:
             if len(cols) == 2:
                 print(f'✓ Maintenance columns exist: {cols}')
             else:
-                print(f'✗ Maintenance columns missing: {set(["maintenance_start", "maintenance_end"]) - set(cols)}')
-        except Exception as e:
-            print(f'✗ Column check error: {e}')
+                _fail(f'✗ Maintenance columns missing: {set(MAINTENANCE_COLUMNS) - set(cols)}')
         
         # Check ID overlap
-        if device_table_count > 0 and devices_count > 0:
-            try:
-                result = conn.execute(text("""
-                    SELECT COUNT(*) FROM device_table dt
-                    INNER JOIN devices d ON dt.id = d.id;
-                """))
-                matching = result.scalar()
-                print(f'\n✓ Matching IDs: {matching} devices')
-                print(f'  (device_table={device_table_count}, devices={devices_count})')
-            except Exception as e:
-                print(f'✗ ID overlap error: {e}')
+        if device_table_count > 0 and devices_count > 0 and matching is not None:
+            print(f'\n✓ Matching IDs: {matching} devices')
+            print(f'  (device_table={device_table_count}, devices={devices_count})')
         
         # Sample bookings
         try:
@@ -74,15 +130,16 @@ try:
                 LEFT JOIN devices d ON b.device_id = d.id
                 LIMIT 5;
             """))
-            bookings = list(result)
             print(f'\n✓ Sample 5 bookings joined to devices:')
-            for b in bookings:
-                status_display = 'NOT_FOUND' if b[2] is None else f'{b[2]} (status={b[3]})'
-                print(f'  Booking {b[0]}: device_id={b[1]} → {status_display}')
+            for b in result.mappings():
+                status_display = 'NOT_FOUND' if b['name'] is None else f"{b['name']} (status={b['status']})"
+                print(f"  Booking {b['booking_id']}: device_id={b['device_id']} → {status_display}")
         except Exception as e:
-            print(f'✗ Booking sample error: {e}')
+            _fail(f'✗ Booking sample error: {e}')
     
     print('\n' + '=' * 80)
+    if failures:
+        sys.exit(1)
     
 except ModuleNotFoundError as e:
     print(f"ERROR: {e}")
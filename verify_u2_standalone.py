@@ -1,6 +1,11 @@
+"""U2 schema reality check.
+
+Table sizes are MySQL statistics estimates; when the ID overlap disagrees
+with them the counts are redone exactly before reporting a mismatch.
+"""
 import os
 import sys
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
 # Get DB URL from env
 db_url = os.getenv("DATABASE_URL")
@@ -11,31 +16,38 @@ if not db_url:
 print(f"Connecting to DB: {db_url.split('@')[-1]}") # Hide password
 
 try:
-    engine = create_engine(db_url)
-    with engine.connect() as conn:
+    # Shared pooled engine; scripts._db reads the same DATABASE_URL
+    from scripts._db import connect, exact_count, fast_counts
+    with connect() as conn:
         print("\n=== Schema Reality Check ===")
         
-        # Check 1: Row Counts
-        devices_count = conn.execute(text("SELECT COUNT(*) FROM devices")).scalar()
-        device_table_count = conn.execute(text("SELECT COUNT(*) FROM device_table")).scalar()
-        print(f"devices table count: {devices_count}")
-        print(f"device_table count: {device_table_count}")
+        # Check 1: Row Counts (estimates, one statistics query)
+        counts = fast_counts(conn, ["devices", "device_table"])
+        devices_count, device_table_count = counts["devices"], counts["device_table"]
+        print(f"devices table count: ~{devices_count}")
+        print(f"device_table count: ~{device_table_count}")
         
         # Check 2: Synchronization
         matching = conn.execute(text("SELECT COUNT(*) FROM device_table dt JOIN devices d ON dt.id = d.id")).scalar()
         print(f"Matching IDs: {matching}")
         
+        if matching != devices_count or matching != device_table_count:
+            # Estimates are approximate: confirm with exact counts first
+            devices_count = exact_count(conn, "devices")
+            device_table_count = exact_count(conn, "device_table")
+            print(f"Exact counts: devices={devices_count}, device_table={device_table_count}")
+        
         if matching != devices_count or matching != device_table_count:
             print("⚠ MISMATCH DETECTED")
             
-            # Find mismatches
-            missing_in_devices = conn.execute(text("SELECT id FROM device_table WHERE id NOT IN (SELECT id FROM devices) LIMIT 5")).fetchall()
+            # Find mismatches (anti-joins on the primary keys)
+            missing_in_devices = conn.execute(text("SELECT dt.id FROM device_table dt LEFT JOIN devices d ON dt.id = d.id WHERE d.id IS NULL LIMIT 5")).scalars().all()
             if missing_in_devices:
-                print(f"IDs in device_table but not devices: {[r[0] for r in missing_in_devices]}")
+                print(f"IDs in device_table but not devices: {missing_in_devices}")
 
-            missing_in_legacy = conn.execute(text("SELECT id FROM devices WHERE id NOT IN (SELECT id FROM device_table) LIMIT 5")).fetchall()
+            missing_in_legacy = conn.execute(text("SELECT d.id FROM devices d LEFT JOIN device_table dt ON d.id = dt.id WHERE dt.id IS NULL LIMIT 5")).scalars().all()
             if missing_in_legacy:
-                print(f"IDs in devices but not device_table: {[r[0] for r in missing_in_legacy]}")
+                print(f"IDs in devices but not device_table: {missing_in_legacy}")
                 
         # Check 3: Maintenance Columns
         print("\nChecking maintenance columns in 'devices'...")
@@ -50,8 +62,8 @@ try:
         # Assuming we migrated properly, bookings should point to device ids that exist in both if synced
         
         print("\n=== Booking FK Sample ===")
-        bookings = conn.execute(text("SELECT device_id FROM booking_table LIMIT 5")).fetchall()
-        print(f"Sample Booking device_ids: {[r[0] for r in bookings]}")
+        bookings = conn.execute(text("SELECT device_id FROM booking_table LIMIT 5")).scalars().all()
+        print(f"Sample Booking device_ids: {bookings}")
 
 except Exception as e:
     print(f"FATAL ERROR: {e}")